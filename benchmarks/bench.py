@@ -0,0 +1,178 @@
+"""Throughput benchmarks for the simulation hot paths.
+
+    python benchmarks/bench.py --output results.json
+    python benchmarks/bench.py --baseline results.json --threshold 0.25
+
+Every metric records whether higher is better; with --baseline the run exits
+non-zero when any metric is worse than the baseline by more than its threshold
+(--threshold, or a per-metric entry in benchmarks/thresholds.json).
+"""
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+THRESHOLDS_FILE = os.path.join(ROOT, "benchmarks", "thresholds.json")
+
+def load(directory, module):
+    # the week folders are plain script directories, so import from each one in turn
+    path = os.path.join(ROOT, directory)
+    sys.path.insert(0, path)
+    try:
+        return importlib.import_module(module)
+    finally:
+        sys.path.remove(path)
+
+def timed(fn, repeat):
+    # best wall time over repeat runs, with training progress output swallowed
+    best = float("inf")
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+    return best
+
+def metric(value, unit, higher_is_better=True):
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+def bench_env_step(scale, repeat):
+    env = load("week4-5", "blackjack_env").BlackjackEnv(seed=0)
+    n = int(200000 * scale)
+    steps = [0]
+
+    def run():
+        steps[0] = 0
+        for _ in range(n):
+            state, done = env.reset(), False
+            while not done:
+                state, _, done = env.step(0 if state[0] >= 17 else 1)
+                steps[0] += 1
+    seconds = timed(run, repeat)
+    return {"env_step": metric(steps[0] / seconds, "steps/s")}
+
+def bench_glie(scale, repeat):
+    agent = load("week4-5", "mc_agent_week4")
+    n = int(50000 * scale)
+    seconds = timed(lambda: agent.run_task_2(n), repeat)
+    return {"run_task_2": metric(n / seconds, "episodes/s")}
+
+def bench_off_policy(scale, repeat):
+    agent = load("week4-5", "mc_agent_week5")
+    n = int(50000 * scale)
+    seconds = timed(lambda: agent.run_off_policy_task(n), repeat)
+    return {"run_off_policy_task": metric(n / seconds, "episodes/s")}
+
+def bench_gbm(scale, repeat):
+    engine = load("week2/quant_challenge", "quant_engine")
+    n, steps = int(50000 * scale), 252
+    seconds = timed(lambda: engine.generate_gbm_paths(100, 0.05, 0.2, 1.0, steps, n), repeat)
+
+    tracemalloc.start()
+    engine.generate_gbm_paths(100, 0.05, 0.2, 1.0, steps, n)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "generate_gbm_paths": metric(n / seconds, "paths/s"),
+        "generate_gbm_paths_peak_mb": metric(peak / 2**20, "MB", higher_is_better=False),
+    }
+
+def bench_ls(scale, repeat):
+    engine = load("week2/quant_challenge", "quant_engine")
+    steps = 50
+    paths = engine.generate_gbm_paths(100, 0.05, 0.2, 1.0, steps, int(50000 * scale))
+    seconds = timed(lambda: engine.price_american_put_ls(paths, 100, 0.05, 1.0), repeat)
+    return {"price_american_put_ls": metric(seconds / (steps - 1) * 1e3, "ms/step", higher_is_better=False)}
+
+def bench_mc_estimate(scale, repeat):
+    task_logic = load("week2/random", "task_logic")
+    sim = task_logic.get_pi_task()["sim"]
+    n = int(10**7 * scale)
+    seconds = timed(lambda: sim.estimate(n), repeat)
+    return {"mc_estimate": metric(n / seconds, "samples/s")}
+
+def bench_estimate_e(scale, repeat):
+    task_logic = load("week2/random", "task_logic")
+    n = int(10**6 * scale)
+    seconds = timed(lambda: task_logic.estimate_e(n), repeat)
+    return {"estimate_e": metric(n / seconds, "trials/s")}
+
+def bench_start_match(scale, repeat):
+    game = load("week1/game_guide", "blackjack").BlackJack()
+    n = int(50000 * scale)
+
+    def run():
+        for _ in range(n):
+            game.start_match(10)
+    seconds = timed(run, repeat)
+    return {"start_match": metric(n / seconds, "hands/s")}
+
+BENCHMARKS = {
+    "env_step": bench_env_step,
+    "run_task_2": bench_glie,
+    "run_off_policy_task": bench_off_policy,
+    "generate_gbm_paths": bench_gbm,
+    "price_american_put_ls": bench_ls,
+    "mc_estimate": bench_mc_estimate,
+    "estimate_e": bench_estimate_e,
+    "start_match": bench_start_match,
+}
+
+def compare(results, baseline, threshold, overrides):
+    # relative change in the bad direction for every metric present in both runs
+    failures = []
+    for name, new in results.items():
+        if name not in baseline: continue
+        old = baseline[name]["value"]
+        worse = (old - new["value"]) / old if new["higher_is_better"] else (new["value"] - old) / old
+        limit = overrides.get(name, threshold)
+        status = "REGRESSION" if worse > limit else "ok"
+        print(f"{name:<32} {old:>14.4g} -> {new['value']:>14.4g} {new['unit']:<11} {-worse:>+8.1%}  {status}")
+        if worse > limit: failures.append(name)
+    return failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="benchmarks to run")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier on problem sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark, best time kept")
+    parser.add_argument("--output", help="write metrics to this JSON file")
+    parser.add_argument("--baseline", help="JSON file from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed fractional regression")
+    args = parser.parse_args(argv)
+
+    np.random.seed(0)
+    results = {}
+    for name in args.only or BENCHMARKS:
+        for metric_name, value in BENCHMARKS[name](args.scale, args.repeat).items():
+            results[metric_name] = value
+            print(f"{metric_name:<32} {value['value']:>14.4g} {value['unit']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        overrides = {}
+        if os.path.exists(THRESHOLDS_FILE):
+            with open(THRESHOLDS_FILE) as f:
+                overrides = json.load(f)
+        print()
+        failures = compare(results, baseline, args.threshold, overrides)
+        if failures:
+            print(f"\n{len(failures)} metric(s) regressed: {', '.join(failures)}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+import numpy as np
+
+# Streaming version of the gambler's ruin notebook: gamblers are simulated in
+# blocks, a chunk of rounds at a time, so memory stays at O(block * chunk) no
+# matter how many gamblers or rounds. Absorbed gamblers are dropped from the
+# active set as soon as they hit a barrier.
+
+class OnlineMoments:
+    """Running count, mean and central moments up to the 4th, merged batch by batch."""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+
+    def add(self, x):
+        x = np.asarray(x, dtype=np.float64).ravel()
+        nb = len(x)
+        if nb == 0: return
+        mb = x.mean()
+        d = x - mb
+        m2b, m3b, m4b = (d ** 2).sum(), (d ** 3).sum(), (d ** 4).sum()
+
+        # pairwise merge of two sets of central moments (Chan et al. / Pebay)
+        na, ma = self.n, self.mean
+        n = na + nb
+        delta = mb - ma
+        self.mean = ma + delta * nb / n
+        m4 = (self.m4 + m4b + delta ** 4 * na * nb * (na * na - na * nb + nb * nb) / n ** 3
+              + 6 * delta ** 2 * (na * na * m2b + nb * nb * self.m2) / n ** 2
+              + 4 * delta * (na * m3b - nb * self.m3) / n)
+        m3 = (self.m3 + m3b + delta ** 3 * na * nb * (na - nb) / n ** 2
+              + 3 * delta * (na * m2b - nb * self.m2) / n)
+        self.m2 = self.m2 + m2b + delta ** 2 * na * nb / n
+        self.m3, self.m4, self.n = m3, m4, n
+
+    @property
+    def variance(self):
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    @property
+    def skewness(self):
+        return np.sqrt(self.n) * self.m3 / self.m2 ** 1.5 if self.m2 > 0 else 0.0
+
+    @property
+    def excess_kurtosis(self):
+        return self.n * self.m4 / self.m2 ** 2 - 3 if self.m2 > 0 else 0.0
+
+class DistributionMoments:
+    """Mean, spread and shape of a discrete distribution, with the same properties as OnlineMoments."""
+
+    def __init__(self, values, probs):
+        self.mean = float(probs @ values)
+        d = values - self.mean
+        self.m2, self.m3, self.m4 = (float(probs @ d ** k) for k in (2, 3, 4))
+
+    @property
+    def variance(self):
+        return self.m2
+
+    @property
+    def std(self):
+        return np.sqrt(self.m2)
+
+    @property
+    def skewness(self):
+        return self.m3 / self.m2 ** 1.5 if self.m2 > 0 else 0.0
+
+    @property
+    def excess_kurtosis(self):
+        return self.m4 / self.m2 ** 2 - 3 if self.m2 > 0 else 0.0
+
+class FixedHistogram:
+    """Histogram over fixed, equal-width bins, filled incrementally; values outside land in under/over.
+
+    Weights default to 1 per value; exact_ruin fills it with probabilities instead.
+    """
+
+    def __init__(self, lo, hi, n_bins=50):
+        self.edges = np.linspace(lo, hi, n_bins + 1)
+        self.counts = np.zeros(n_bins)
+        self.under = 0.0
+        self.over = 0.0
+
+    def add(self, x, weights=None):
+        x = np.asarray(x, dtype=np.float64).ravel()
+        w = np.ones_like(x) if weights is None else np.asarray(weights, dtype=np.float64).ravel()
+        lo, hi = self.edges[0], self.edges[-1]
+        self.under += w[x < lo].sum()
+        self.over += w[x > hi].sum()
+        inside = (x >= lo) & (x <= hi)
+        n_bins = len(self.counts)
+        idx = np.minimum(((x[inside] - lo) / (hi - lo) * n_bins).astype(np.int64), n_bins - 1)
+        self.counts += np.bincount(idx, weights=w[inside], minlength=n_bins)
+
+def _simulate_block(n, n_rounds, start, target, p, chunk, rng, result):
+    bankroll = np.full(n, start, dtype=np.int64)
+    n_ruined = n_target = filled = 0
+    for t0 in range(0, n_rounds, chunk):
+        if not len(bankroll): break
+        c = min(chunk, n_rounds - t0)
+
+        # wins for the chunk; a fair coin takes 8 flips from each random byte
+        if p == 0.5 and c % 8 == 0:
+            wins = np.unpackbits(rng.integers(0, 256, (len(bankroll), c // 8), dtype=np.uint8), axis=1)
+        else:
+            wins = rng.random((len(bankroll), c), dtype=np.float32) < p
+
+        # running bankroll: start + 2 * wins so far - rounds so far
+        path = np.cumsum(wins, axis=1, dtype=np.int32)
+        path *= 2
+        path += (bankroll[:, None] - np.arange(1, c + 1)).astype(np.int32)
+
+        # first barrier hit in the chunk; from then on the path stays at the barrier
+        ruin = path <= 0
+        hit = ruin | (path >= target) if target is not None else ruin
+        done = hit.any(axis=1)
+        rows = np.flatnonzero(done)
+        first = np.argmax(hit[rows], axis=1)
+        to_target = ~ruin[rows, first]
+        level = to_target * (target or 0)
+        absorbed = np.arange(c) >= first[:, None]
+        path[rows] = np.where(absorbed, level[:, None], path[rows])
+
+        # per-round totals over the whole block: active paths plus gamblers parked at the target
+        result["path_sum"][t0 + 1:t0 + c + 1] += path.sum(axis=0) + n_target * (target or 0)
+
+        times = t0 + first + 1
+        result["ruin_time"].add(times[~to_target])
+        result["target_time"].add(times[to_target])
+        result["final"].add(level)
+        result["histogram"].add(level)
+        n_ruined += int((~to_target).sum())
+        n_target += int(to_target.sum())
+
+        # compact: only gamblers still in play are carried into the next chunk
+        bankroll = path[~done, -1]
+        filled = t0 + c
+
+    # gamblers never absorbed: their last bankroll is final
+    result["final"].add(bankroll)
+    result["histogram"].add(bankroll)
+    result["ruined"] += n_ruined
+    result["reached_target"] += n_target
+
+    # rounds after everyone in the block was absorbed
+    if n_target:
+        result["path_sum"][filled + 1:] += n_target * target
+
+def simulate_ruin(n_gamblers, n_rounds, start=100, target=None, p=0.5, chunk=256, block=1 << 16,
+                  bins=50, rng=None):
+    """Fair (p = 0.5) or biased ±1 betting for n_gamblers over n_rounds.
+
+    Bankrolls at or below 0 are ruined, and with a target, bankrolls reaching
+    it stop playing too. Returns a dict with the counts "ruined" and
+    "reached_target", OnlineMoments for "final" bankroll, "ruin_time" and
+    "target_time", a FixedHistogram of final bankrolls and the "mean_path"
+    of the average bankroll after every round.
+    """
+    rng = np.random.default_rng(rng)
+    hi = target if target is not None else start + 5 * np.sqrt(n_rounds) + 1
+    result = {
+        "n_gamblers": n_gamblers,
+        "ruined": 0,
+        "reached_target": 0,
+        "final": OnlineMoments(),
+        "ruin_time": OnlineMoments(),
+        "target_time": OnlineMoments(),
+        "histogram": FixedHistogram(0, hi, bins),
+        "path_sum": np.zeros(n_rounds + 1),
+    }
+    result["path_sum"][0] = start * n_gamblers
+    for b0 in range(0, n_gamblers, block):
+        _simulate_block(min(block, n_gamblers - b0), n_rounds, start, target, p, chunk, rng, result)
+    result["mean_path"] = result.pop("path_sum") / n_gamblers
+    return result
+
+def exact_ruin(n_rounds, start=100, target=None, p=0.5, stake=1, bins=50):
+    """Exact wealth distribution after n_rounds of ±stake bets, by propagating probabilities.
+
+    The probability vector runs over wealth 0..upper, with 0 (anything at or
+    below 0) and the target as absorbing levels. Each round only the band of
+    live wealth levels that can be nonzero is moved, as two shifted slices, so
+    a round costs O(band) rather than a matrix product. Returns a dict with
+    "values" and "distribution" (the pmf over wealth), "ruin_probability" and
+    "target_probability", their growth per round in "ruin_by_round" and
+    "target_by_round", "mean_path", and "final" and "histogram" shaped like
+    the simulate_ruin results so the same plots and CLT checks apply.
+    """
+    if not 0 < start < (target if target is not None else np.inf):
+        raise ValueError("start must lie strictly between 0 and target")
+    upper = target if target is not None else start + stake * n_rounds
+    values = np.arange(upper + 1)
+    probs = np.zeros(upper + 1)
+    probs[start] = 1.0
+    q = 1.0 - p
+
+    ruin_by_round = np.zeros(n_rounds + 1)
+    target_by_round = np.zeros(n_rounds + 1)
+    mean_path = np.zeros(n_rounds + 1)
+    mean_path[0] = start
+
+    # live wealth band [lo, hi], always strictly inside the barriers
+    lo = hi = start
+    top = target - 1 if target is not None else upper
+    for t in range(1, n_rounds + 1):
+        live = probs[lo:hi + 1].copy()
+        probs[lo:hi + 1] = 0.0
+
+        # wins: levels pushed to target or beyond are absorbed at the target
+        a = lo + stake
+        k = len(live) if target is None else min(max(target - a, 0), len(live))
+        probs[a:a + k] += p * live[:k]
+        if k < len(live): probs[target] += p * live[k:].sum()
+
+        # losses: levels pushed to 0 or below are ruined
+        a = lo - stake
+        k = min(max(1 - a, 0), len(live))
+        probs[0] += q * live[:k].sum()
+        probs[a + k:a + len(live)] += q * live[k:]
+
+        lo, hi = max(lo - stake, 1), min(hi + stake, top)
+        ruin_by_round[t] = probs[0]
+        if target is not None: target_by_round[t] = probs[target]
+        mean_path[t] = probs[lo:hi + 1] @ values[lo:hi + 1] + target_by_round[t] * (target or 0)
+
+    histogram = FixedHistogram(0, target if target is not None else start + 5 * stake * np.sqrt(n_rounds) + 1, bins)
+    histogram.add(values, probs)
+    return {
+        "values": values,
+        "distribution": probs,
+        "ruin_probability": probs[0],
+        "target_probability": probs[target] if target is not None else 0.0,
+        "ruin_by_round": ruin_by_round,
+        "target_by_round": target_by_round,
+        "mean_path": mean_path,
+        "final": DistributionMoments(values, probs),
+        "histogram": histogram,
+    }
+
+if __name__ == "__main__":
+    import time
+    start_time = time.time()
+    res = simulate_ruin(1000000, 1000, start=100)
+    final = res["final"]
+    print(f"Simulated {res['n_gamblers']} gamblers x 1000 rounds in {time.time()-start_time:.1f}s")
+    print(f"Mean Final Wealth: ${final.mean:.2f} (std {final.std:.2f})")
+    print(f"Ruined Gamblers (Bankroll = $0): {res['ruined']} / {res['n_gamblers']}")
+    # for a fair game the final wealth should look normal: skew and excess kurtosis near 0
+    print(f"Skewness: {final.skewness:.4f}, excess kurtosis: {final.excess_kurtosis:.4f}")
+
+    start_time = time.time()
+    exact = exact_ruin(1000, start=100)
+    print(f"Exact distribution in {(time.time()-start_time)*1000:.0f}ms: mean ${exact['final'].mean:.2f} "
+          f"(std {exact['final'].std:.2f}), ruin probability {exact['ruin_probability']:.5f}")
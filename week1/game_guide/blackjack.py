@@ -1,26 +1,54 @@
 import random
-from cards import Deck, Hand, Card, Rank 
-
-def calculate_winnings(outcome: str, bet: int) -> int:
-    if "BLACKJACK (pays 1.5x)" in outcome:
-        return int(bet * 1.5)
-    if "PLAYER WINS" in outcome:
-        return bet
-    if "PUSH" in outcome:
-        return 0
-    return -bet
+from enum import Enum
+from cards import Shoe, Hand, Card, Rank 
+
+class Outcome(Enum):
+    # (message, payout as a multiple of the bet)
+    BLACKJACK = ("PLAYER WINS: BLACKJACK (pays 1.5x).", 1.5)
+    DEALER_BLACKJACK = ("DEALER WINS: Dealer BLACKJACK.", -1)
+    BOTH_BLACKJACK = ("PUSH: Both have Blackjack.", 0)
+    PLAYER_BUST = ("DEALER WINS: Player BUSTED.", -1)
+    DEALER_BUST = ("PLAYER WINS: Dealer BUSTED.", 1)
+    PUSH = ("PUSH: It's a tie. Bet returned.", 0)
+    PLAYER_HIGHER = ("PLAYER WINS: Higher value.", 1)
+    DEALER_HIGHER = ("DEALER WINS: Higher value.", -1)
+
+    @property
+    def message(self):
+        return self.value[0]
+
+    @property
+    def payout(self):
+        return self.value[1]
+
+    def __str__(self):
+        return self.message
+
+class Event(Enum):
+    # things the engine reports to its observer instead of printing
+    DEALER_TURN = "dealer_turn"
+    DEALER_REVEAL = "dealer_reveal"
+    DEALER_HIT = "dealer_hit"
+    DEALER_BUST = "dealer_bust"
+    DEALER_STAND = "dealer_stand"
+
+def calculate_winnings(outcome: Outcome, bet: int) -> int:
+    return int(bet * outcome.payout)
 
 class BlackJack:
-    def __init__(self):
-        self.deck = Deck()
+    def __init__(self, n_decks=6, penetration=0.75, rng=None, observer=None):
+        # cards come from a shoe that is only reshuffled once the cut card has been dealt
+        self.deck = Shoe(n_decks, penetration, rng)
+        # observer(event, game, card) is called on dealer events; None plays silently
+        self.observer = observer
         self.player_hands = []
         self.dealer_hand = Hand()
         self.active_hand_index = 0
         self.is_doubling_down = False
 
     def start_match(self, initial_bet):
-        self.deck.reset()
-        self.deck.shuffle()
+        if self.deck.needs_shuffle:
+            self.deck.shuffle()
         self.dealer_hand.flush()
         self.player_hands = [Hand(initial_bet)]
         self.active_hand_index = 0
@@ -33,18 +61,18 @@ class BlackJack:
             self.player_hands[0].add_card(self.deck.draw())
             self.dealer_hand.add_card(self.deck.draw())
 
-    def _check_initial_win_conditions(self) -> str | None:
+    def _check_initial_win_conditions(self) -> Outcome | None:
         p_hand = self.player_hands[0]
         player_21 = p_hand.calculate_value() == 21 and len(p_hand.cards) == 2
         dealer_21 = self.dealer_hand.calculate_value() == 21 and len(self.dealer_hand.cards) == 2
         
         if player_21 or dealer_21:
             if player_21 and dealer_21:
-                return "PUSH: Both have Blackjack."
+                return Outcome.BOTH_BLACKJACK
             if player_21:
-                return "PLAYER WINS: BLACKJACK (pays 1.5x)." 
+                return Outcome.BLACKJACK
             if dealer_21:
-                return "DEALER WINS: Dealer BLACKJACK."
+                return Outcome.DEALER_BLACKJACK
         return None
 
     def get_active_hand(self):
@@ -73,59 +101,40 @@ class BlackJack:
     def split(self):
         current = self.get_active_hand()
         new_hand = Hand(current.bet)
-        new_hand.add_card(current.cards.pop())
+        new_hand.add_card(current.pop_card())
         current.add_card(self.deck.draw())
         new_hand.add_card(self.deck.draw())
         self.player_hands.insert(self.active_hand_index + 1, new_hand)
 
+    def _notify(self, event: Event, card: Card | None = None):
+        if self.observer is not None:
+            self.observer(event, self, card)
+
     def dealer_play(self) -> str:
-        print("\n--- Dealer's Turn ---")
+        self._notify(Event.DEALER_TURN)
         if len(self.dealer_hand.cards) == 2:
-            print("\n** Dealer reveals their hidden card! **")
-            self.display_dealer_hand(reveal=True)
+            self._notify(Event.DEALER_REVEAL)
 
         while self.dealer_hand.calculate_value() < 17:
-            print("\nDealer hits.") 
             drawn_card = self.deck.draw()
             self.dealer_hand.add_card(drawn_card)
-            print(f"Dealer draws a {str(drawn_card)}.")
-            self.display_dealer_hand(reveal=True)
+            self._notify(Event.DEALER_HIT, drawn_card)
             
             if self._is_busted(self.dealer_hand):
+                self._notify(Event.DEALER_BUST)
                 return "\nDealer BUSTED!"
         
+        self._notify(Event.DEALER_STAND)
         return f"\nDealer stands at {self.dealer_hand.calculate_value()}."
 
     def _is_busted(self, hand: Hand) -> bool:
         return hand.calculate_value() > 21
 
-    def compare_hand(self, hand: Hand) -> str:
+    def compare_hand(self, hand: Hand) -> Outcome:
         p_val = hand.calculate_value()
         d_val = self.dealer_hand.calculate_value()
-        if p_val > 21: return "DEALER WINS: Player BUSTED."
-        if d_val > 21: return "PLAYER WINS: Dealer BUSTED."
-        if p_val == d_val: return "PUSH: It's a tie. Bet returned."
-        if p_val > d_val: return "PLAYER WINS: Higher value."
-        return "DEALER WINS: Higher value."
-
-    def display_dealer_hand(self, reveal=False):
-        print("\nDEALER:", self.dealer_hand.calculate_value() if reveal else "???")
-        if not reveal and len(self.dealer_hand.cards) == 2:
-            v = self.dealer_hand.cards[0].display_lines()
-            h = [" ___ ", "|## |", "|###|", "|_##|"]
-            for i in range(4): print(f"{v[i]} {h[i]}")
-        else:
-            print(self.dealer_hand)
-
-    def display_player_hand(self):
-        multi = len(self.player_hands) > 1
-        for i, hand in enumerate(self.player_hands):
-            if multi:
-                label = f"HAND {i+1}"
-                if i == self.active_hand_index:
-                    print(f"\n--- CURRENTLY PLAYING: {label} ({hand.calculate_value()}) ---")
-                else:
-                    print(f"\nPLAYER {label}: {hand.calculate_value()}")
-            else:
-                print(f"\nPLAYER: {hand.calculate_value()}")
-            print(hand)
\ No newline at end of file
+        if p_val > 21: return Outcome.PLAYER_BUST
+        if d_val > 21: return Outcome.DEALER_BUST
+        if p_val == d_val: return Outcome.PUSH
+        if p_val > d_val: return Outcome.PLAYER_HIGHER
+        return Outcome.DEALER_HIGHER
@@ -30,12 +30,31 @@ class Rank(Enum):
     def blackjack_value(self):
         return self.value[1]
 
+# interned cards: Card(rank, suit) always returns the same immutable instance
+_POOL = {}
+
 class Card:
-    def __init__(self, rank: Rank, suit: Suit):
-        self.rank = rank
-        self.suit = suit
-        self.value = rank.blackjack_value
-        self.display_char = rank.display_char
+    __slots__ = ("rank", "suit", "value", "display_char", "is_ace", "index")
+
+    def __new__(cls, rank: Rank, suit: Suit):
+        card = _POOL.get((rank, suit))
+        if card is None:
+            card = super().__new__(cls)
+            set_field = object.__setattr__
+            set_field(card, "rank", rank)
+            set_field(card, "suit", suit)
+            set_field(card, "value", rank.blackjack_value)
+            set_field(card, "display_char", rank.display_char)
+            set_field(card, "is_ace", rank is Rank.ACE)
+            set_field(card, "index", len(_POOL))
+            _POOL[(rank, suit)] = card
+        return card
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Card is immutable")
+
+    def __reduce__(self):
+        return (Card, (self.rank, self.suit))
 
     def display_lines(self):
         underscores = "__" if len(self.display_char) == 1 else "_"
@@ -51,47 +70,83 @@ class Card:
     def __str__(self):
         return f"{self.display_char}{self.suit.value}"
 
-class Deck:
-    def __init__(self):
-        self._cards = []
-        self.reset()
+# one deck's worth of pooled cards, indexed by Card.index
+CARDS = tuple(Card(rank, suit) for suit in Suit for rank in Rank)
+
+class Shoe:
+    """n_decks of cards dealt from a shuffled list of card indices.
+
+    A cut card sits at `penetration` of the way through the shoe; once it has
+    been dealt, needs_shuffle turns true and the shoe should be shuffled
+    before the next hand. Drawing past the end reshuffles on the spot.
+    """
+
+    def __init__(self, n_decks: int = 6, penetration: float = 0.75, rng: random.Random | None = None):
+        self.rng = rng or random.Random()
+        self._order = list(range(len(CARDS))) * n_decks
+        self._cut = int(len(self._order) * penetration)
+        self._pos = 0
+        self.shuffle()
 
     def reset(self):
-        self._cards.clear()
-        for suit in Suit:
-            for rank in Rank:
-                self._cards.append(Card(rank, suit))
+        self.shuffle()
 
     def shuffle(self):
-        random.shuffle(self._cards)
+        self.rng.shuffle(self._order)
+        self._pos = 0
 
-    def draw(self) -> Card | None:
-        if self._cards:
-            return self._cards.pop()
-        return None
+    @property
+    def needs_shuffle(self) -> bool:
+        return self._pos >= self._cut
+
+    def remaining(self) -> int:
+        return len(self._order) - self._pos
+
+    def draw(self) -> Card:
+        if self._pos == len(self._order):
+            self.shuffle()
+        card = CARDS[self._order[self._pos]]
+        self._pos += 1
+        return card
+
+class Deck(Shoe):
+    # a single deck, reshuffled whenever it runs out
+    def __init__(self, rng: random.Random | None = None):
+        super().__init__(1, 1.0, rng)
 
 class Hand:
+    # value and soft_aces (aces still counted as 11) are kept up to date as cards arrive
     def __init__(self, bet=0):
         self.cards = []
         self.bet = bet
+        self.value = 0
+        self.soft_aces = 0
 
     def add_card(self, card: Card):
         self.cards.append(card)
+        self.value += card.value
+        if card.is_ace:
+            self.soft_aces += 1
+        while self.value > 21 and self.soft_aces:
+            self.value -= 10
+            self.soft_aces -= 1
+
+    def pop_card(self) -> Card:
+        # rare (splits only), so recount from scratch
+        card = self.cards.pop()
+        cards = self.cards
+        self.flush()
+        for c in cards:
+            self.add_card(c)
+        return card
 
     def flush(self):
-        self.cards.clear()
+        self.cards = []
+        self.value = 0
+        self.soft_aces = 0
 
     def calculate_value(self) -> int:
-        value = 0
-        num_aces = 0
-        for card in self.cards:
-            if card.rank is Rank.ACE:
-                num_aces += 1
-            value += card.value
-        while value > 21 and num_aces > 0:
-            value -= 10
-            num_aces -= 1
-        return value
+        return self.value
 
     def __str__(self):
         if not self.cards:
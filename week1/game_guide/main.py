@@ -1,5 +1,5 @@
 import sys
-from blackjack import BlackJack, calculate_winnings
+from blackjack import BlackJack, Outcome, Event, calculate_winnings
 
 def print_rules():
     print("Rules:")
@@ -15,8 +15,42 @@ def print_rules():
     print(" The dealer stops hitting at 17.")
     print("-" * 40)
 
+def display_dealer_hand(game, reveal=False):
+    print("\nDEALER:", game.dealer_hand.calculate_value() if reveal else "???")
+    if not reveal and len(game.dealer_hand.cards) == 2:
+        v = game.dealer_hand.cards[0].display_lines()
+        h = [" ___ ", "|## |", "|###|", "|_##|"]
+        for i in range(4): print(f"{v[i]} {h[i]}")
+    else:
+        print(game.dealer_hand)
+
+def display_player_hand(game):
+    multi = len(game.player_hands) > 1
+    for i, hand in enumerate(game.player_hands):
+        if multi:
+            label = f"HAND {i+1}"
+            if i == game.active_hand_index:
+                print(f"\n--- CURRENTLY PLAYING: {label} ({hand.calculate_value()}) ---")
+            else:
+                print(f"\nPLAYER {label}: {hand.calculate_value()}")
+        else:
+            print(f"\nPLAYER: {hand.calculate_value()}")
+        print(hand)
+
+def show_dealer_event(event, game, card):
+    # observer: the engine reports what the dealer does, the TUI draws it
+    if event is Event.DEALER_TURN:
+        print("\n--- Dealer's Turn ---")
+    elif event is Event.DEALER_REVEAL:
+        print("\n** Dealer reveals their hidden card! **")
+        display_dealer_hand(game, reveal=True)
+    elif event is Event.DEALER_HIT:
+        print("\nDealer hits.")
+        print(f"Dealer draws a {str(card)}.")
+        display_dealer_hand(game, reveal=True)
+
 def main_game_loop():
-    game = BlackJack()
+    game = BlackJack(observer=show_dealer_event)
     money = 5000
     print_rules()
     
@@ -40,22 +74,23 @@ def main_game_loop():
 
         # To test split
         # from cards import Card, Rank, Suit
-        # game.player_hands[0].cards = [Card(Rank.ACE, Suit.SPADES), Card(Rank.ACE, Suit.HEARTS)]
+        # game.player_hands[0].flush()
+        # for card in (Card(Rank.ACE, Suit.SPADES), Card(Rank.ACE, Suit.HEARTS)): game.player_hands[0].add_card(card)
         
         if initial_result:
             print("\n--- Initial Outcome ---")
-            game.display_dealer_hand(reveal=True)
-            game.display_player_hand()
+            display_dealer_hand(game, reveal=True)
+            display_player_hand(game)
             outcome = initial_result
             winnings_delta = calculate_winnings(outcome, bet)
             money += bet + winnings_delta 
             print('\n' + "-" * 40)
-            if "PLAYER WINS: BLACKJACK" in outcome:
+            if outcome is Outcome.BLACKJACK:
                 print(f"Player BLACKJACK! You won ${winnings_delta}!")
             elif winnings_delta > 0:
                 print(f"You won ${winnings_delta}!")
             elif winnings_delta < 0:
-                print(f"You lost ${abs(winnings_delta)}! ({outcome.split(':')[1].strip()})")
+                print(f"You lost ${abs(winnings_delta)}! ({outcome.message.split(':')[1].strip()})")
             else:
                 print(f"PUSH. Bet returned.")
             print("-" * 40)
@@ -69,8 +104,8 @@ def main_game_loop():
             turn_active = True
             
             while turn_active:
-                game.display_dealer_hand(reveal=False)
-                game.display_player_hand()
+                display_dealer_hand(game, reveal=False)
+                display_player_hand(game)
 
                 allowed_actions = "(H)it, (S)tand"
                 can_double = is_first_play and (money >= hand.bet)
@@ -115,8 +150,8 @@ def main_game_loop():
             print(game.dealer_play())
 
         print("-" * 40)
-        game.display_dealer_hand(reveal=True)
-        game.display_player_hand()
+        display_dealer_hand(game, reveal=True)
+        display_player_hand(game)
         print('\n' + "-" * 40)
 
         for i, h in enumerate(game.player_hands):
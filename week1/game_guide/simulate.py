@@ -0,0 +1,88 @@
+import random
+from blackjack import BlackJack, calculate_winnings
+from cards import Hand, Card
+
+# a strategy maps (hand, dealer upcard, can_double, can_split) to one of the
+# TUI's action letters: 'H', 'S', 'D' or 'P'
+
+def dealer_strategy(hand: Hand, upcard: Card, can_double: bool, can_split: bool) -> str:
+    # mimic the dealer: hit below 17
+    return 'H' if hand.calculate_value() < 17 else 'S'
+
+def play_hand(game: BlackJack, strategy, bet: int, money: int) -> int:
+    """Play one hand with the same rules as main.py, without I/O; returns the bankroll change.
+
+    money is the bankroll before the bet and limits doubles and splits.
+    """
+    money -= bet
+    outcome = game.start_match(bet)
+    if outcome is not None:
+        return calculate_winnings(outcome, bet)
+
+    upcard = game.dealer_hand.cards[0]
+    while game.active_hand_index < len(game.player_hands):
+        hand = game.get_active_hand()
+        game.is_doubling_down = False
+        is_first_play = True
+        while True:
+            can_double = is_first_play and money >= hand.bet
+            can_split = can_double and hand.cards[0].rank == hand.cards[1].rank
+            action = strategy(hand, upcard, can_double, can_split)
+
+            if action == 'P' and can_split:
+                money -= hand.bet
+                game.split()
+                continue
+            if action == 'D' and can_double:
+                money -= hand.bet
+                hand.bet *= 2
+                _, game_ended = game.double_down()
+            elif action == 'H':
+                _, game_ended = game.hit()
+            else:
+                game_ended = True
+
+            is_first_play = False
+            if game_ended or game._is_busted(hand): break
+        game.active_hand_index += 1
+
+    if not all(game._is_busted(h) for h in game.player_hands):
+        game.dealer_play()
+    return sum(calculate_winnings(game.compare_hand(h), h.bet) for h in game.player_hands)
+
+def simulate_sessions(strategy, n_hands: int, bankroll: int, n_sessions: int = 1000, bet: int = 10,
+                      n_decks: int = 6, seed: int | None = None) -> tuple[list[list[int]], dict]:
+    """Play n_sessions bankroll sessions of up to n_hands flat bets each.
+
+    A session is ruined once the bankroll cannot cover another bet. Returns
+    (trajectories, stats): the bankroll after every hand for each session,
+    starting with the initial bankroll, and a dict of ruin statistics.
+    """
+    master = random.Random(seed)
+    trajectories = []
+    ruin_times = []
+    for _ in range(n_sessions):
+        game = BlackJack(n_decks, rng=random.Random(master.getrandbits(64)))
+        money = bankroll
+        path = [money]
+        for _ in range(n_hands):
+            if money < bet:
+                ruin_times.append(len(path) - 1)
+                break
+            money += play_hand(game, strategy, bet, money)
+            path.append(money)
+        else:
+            if money < bet: ruin_times.append(n_hands)
+        trajectories.append(path)
+
+    hands_played = sum(len(path) - 1 for path in trajectories)
+    finals = [path[-1] for path in trajectories]
+    stats = {
+        "sessions": n_sessions,
+        "ruined": len(ruin_times),
+        "ruin_probability": len(ruin_times) / n_sessions,
+        "mean_hands_to_ruin": sum(ruin_times) / len(ruin_times) if ruin_times else None,
+        "mean_final_bankroll": sum(finals) / n_sessions,
+        "return_per_hand": (sum(finals) - bankroll * n_sessions) / (bet * hands_played) if hands_played else 0.0,
+    }
+    return trajectories, stats
@@ -1,6 +1,7 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from quant_engine import generate_gbm_paths, black_scholes_call, price_american_put_ls
+from quant_engine import (generate_gbm_paths, black_scholes_call, price_american_put_ls, price_option,
+                          price_option_qmc, european_call, price_asian_call_cv, variance_reduction_report)
 
 # Configuration
 S0, mu, sigma, T, steps, n_paths = 100, 0.05, 0.20, 1.0, 252, 50000
@@ -36,15 +37,15 @@ print("Asset path plot saved.")
 bs_price = black_scholes_call(S0, 100, T, mu, sigma)
 mc_price = np.exp(-mu * T) * np.mean(np.maximum(paths[:, -1] - 100, 0))
 
-# Task 3: Asian
-asian_price = np.exp(-mu * T) * np.mean(np.maximum(np.mean(paths, axis=1) - 100, 0))
+# Task 3: Asian, with the closed-form geometric Asian as control variate
+asian_price, asian_se = price_asian_call_cv(S0, 100, mu, sigma, T, steps, n_paths)
 
 # Task 4: American
 american_put = price_american_put_ls(paths, 100, mu, T)
 
 print(f"{'Black-Scholes Price':<35} | {bs_price:>12.4f}")
 print(f"{'Monte Carlo (European)':<35} | {mc_price:>12.4f}")
-print(f"{'Asian Call (Arithmetic)':<35} | {asian_price:>12.4f}")
+print(f"{'Asian Call (Arithmetic)':<35} | {asian_price:>12.4f} ± {1.96 * asian_se:.4f}")
 print(f"{'American Put (L-S)':<35} | {american_put:>12.4f}")
 print(f"{'='*55}")
 
@@ -52,25 +53,24 @@ print("[*] Generating Analysis Plots...")
 
 # 1. Convergence Plot (Task 2)
 n_vals = np.geomspace(100, 50000, 25).astype(int)
-errors = [abs(np.exp(-mu*T)*np.mean(np.maximum(generate_gbm_paths(S0, mu, sigma, T, steps, n)[:,-1]-100, 0)) - bs_price) for n in n_vals]
+errors = [abs(price_option(european_call(100), S0, mu, sigma, T, steps, n)[0] - bs_price) for n in n_vals]
+# Sobol rounds each replicate up to a power of two, so plot QMC at the point counts actually used
+qmc_runs = [price_option_qmc(european_call(100), S0, mu, sigma, T, steps, n) for n in n_vals]
+qmc_n = [n for _, _, n in qmc_runs]
+qmc_errors = [abs(price - bs_price) for price, _, _ in qmc_runs]
 
 plt.figure(figsize=(10, 5))
 plt.loglog(n_vals, errors, 's-', color='darkblue', label='MC Error')
+plt.loglog(qmc_n, qmc_errors, 'o-', color='purple', label='Scrambled Sobol QMC Error')
 plt.loglog(n_vals, 1/np.sqrt(n_vals), '--', color='gray', label='Theoretical (1/√N)')
 plt.title("Task 2: Error Convergence vs Number of Simulations")
 plt.xlabel("N (Simulations)"); plt.ylabel("Absolute Price Error"); plt.legend(); plt.grid(True, which="both", alpha=0.3)
 plt.savefig('convergence_plot.png')
 
 # 2. Variance Reduction (Task 5)
-def get_anti_err(N):
-    eps = np.random.normal(0, 1, size=(N // 2, steps))
-    shocks = np.concatenate([eps, -eps], axis=0)
-    ST = S0 * np.exp(np.sum((mu - 0.5*sigma**2)*(T/steps) + sigma*shocks*np.sqrt(T/steps), axis=1))
-    return np.std(np.exp(-mu*T)*np.maximum(ST-100, 0)) / np.sqrt(N)
-
-N_vals_v = np.linspace(1000, 50000, 25).astype(int)
-err_v = [np.std(np.exp(-mu*T)*np.maximum(generate_gbm_paths(S0, mu, sigma, T, steps, N)[:,-1]-100, 0))/np.sqrt(N) for N in N_vals_v]
-err_a = [get_anti_err(N) for N in N_vals_v]
+N_vals_v = np.linspace(1000, 50000, 25).astype(int) // 2 * 2  # antithetic pairs need an even N
+err_v = [price_option(european_call(100), S0, mu, sigma, T, steps, N)[1] for N in N_vals_v]
+err_a = [price_option(european_call(100), S0, mu, sigma, T, steps, N, method="antithetic")[1] for N in N_vals_v]
 
 plt.figure(figsize=(10, 5))
 plt.plot(N_vals_v, err_v, 'x-', label='Vanilla MC Error', color='orange')
@@ -79,4 +79,9 @@ plt.title("Task 5: Variance Reduction Performance")
 plt.xlabel("N (Simulations)"); plt.ylabel("Standard Error"); plt.legend(); plt.grid(alpha=0.3)
 plt.savefig('variance_reduction.png')
 
+print_section("VARIANCE REDUCTION (SPEEDUP VS PLAIN MC)")
+for case, rows in variance_reduction_report(S0, 100, mu, sigma, T, steps, n_paths).items():
+    for name, price, se, speedup in rows:
+        print(f"{case + ' / ' + name:<35} | {price:>8.4f} ± {1.96 * se:.4f} | {speedup:>7.1f}x")
+
 print("Done. Images saved to directory.")
\ No newline at end of file
@@ -1,16 +1,164 @@
 import numpy as np
-from scipy.stats import norm
+import time
+from scipy.stats import norm, qmc
 
-def generate_gbm_paths(S0, mu, sigma, T, steps, n_paths):
+def generate_gbm_paths(S0, mu, sigma, T, steps, n_paths, rng=None):
     """Task 1: Vectorized GBM Simulation"""
+    return next(iter_gbm_paths(S0, mu, sigma, T, steps, n_paths, block_size=n_paths, rng=rng))
+
+def iter_gbm_paths(S0, mu, sigma, T, steps, n_paths, block_size=10000, dtype=np.float64, rng=None):
+    """Task 1 (streaming): yields (block, steps + 1) GBM path blocks, built in place"""
+    # rng may be a seed, a SeedSequence or a Generator shared with the caller
+    rng = np.random.default_rng(rng)
     dt = T / steps
-    shocks = np.random.normal(0, np.sqrt(dt), size=(n_paths, steps))
     # Ito's Lemma formulation
     drift = (mu - 0.5 * sigma**2) * dt
-    diffusion = sigma * shocks
-    log_returns = np.cumsum(drift + diffusion, axis=1)
-    log_returns = np.insert(log_returns, 0, 0, axis=1) 
-    return S0 * np.exp(log_returns)
+    for start in range(0, n_paths, block_size):
+        n = min(block_size, n_paths - start)
+        block = np.empty((n, steps + 1), dtype=dtype)
+        block[:, 0] = 0
+        block[:, 1:] = rng.normal(0, np.sqrt(dt), size=(n, steps))
+        block[:, 1:] *= sigma
+        block[:, 1:] += drift
+        np.cumsum(block, axis=1, out=block)
+        np.exp(block, out=block)
+        block *= S0
+        yield block
+
+def price_stream(payoff, S0, mu, sigma, T, steps, n_paths, block_size=10000, dtype=np.float64, rng=None):
+    """Discounted mean payoff and its standard error from running sums over path blocks"""
+    total, total_sq = 0.0, 0.0
+    for block in iter_gbm_paths(S0, mu, sigma, T, steps, n_paths, block_size, dtype, rng):
+        values = payoff(block).astype(np.float64)
+        total += values.sum()
+        total_sq += values @ values
+    mean = total / n_paths
+    var = max(total_sq / n_paths - mean**2, 0.0) * n_paths / max(n_paths - 1, 1)
+    df = np.exp(-mu * T)
+    return df * mean, df * np.sqrt(var / n_paths)
+
+def european_call(K):
+    def payoff(paths):
+        return np.maximum(paths[:, -1] - K, 0)
+    # only S_T matters, so pricing can sample it directly
+    payoff.path_dependent = False
+    return payoff
+
+def asian_call(K):
+    def payoff(paths):
+        return np.maximum(paths.mean(axis=1) - K, 0)
+    payoff.path_dependent = True
+    return payoff
+
+def price_european_call_stream(S0, K, mu, sigma, T, steps, n_paths, **kwargs):
+    """Task 2 (streaming): European call priced block by block"""
+    return price_stream(european_call(K), S0, mu, sigma, T, steps, n_paths, **kwargs)
+
+def price_asian_call_stream(S0, K, mu, sigma, T, steps, n_paths, **kwargs):
+    """Task 3 (streaming): arithmetic Asian call priced block by block"""
+    return price_stream(asian_call(K), S0, mu, sigma, T, steps, n_paths, **kwargs)
+
+def _strata_sizes(n_paths, strata):
+    # draws per stratum: at least 2 each for a variance, the remainder spread over the first strata
+    if n_paths < 2:
+        raise ValueError("stratified sampling needs at least 2 paths")
+    strata = min(strata, n_paths // 2)
+    return n_paths // strata + (np.arange(strata) < n_paths % strata)
+
+def sample_terminal(S0, mu, sigma, T, n_paths, method="plain", strata=100, rng=None):
+    """Exact S_T draws from the lognormal law of GBM, no time stepping"""
+    rng = np.random.default_rng(rng)
+    if method == "antithetic":
+        if n_paths < 2 or n_paths % 2:
+            raise ValueError(f"antithetic sampling needs an even number of paths, got {n_paths}")
+        # pairs are (i, i + n_paths // 2)
+        z = rng.normal(0, 1, size=n_paths // 2)
+        z = np.concatenate([z, -z])
+    elif method == "stratified":
+        # equal-probability strata of the normal, stratum by stratum
+        sizes = _strata_sizes(n_paths, strata)
+        u = (np.repeat(np.arange(len(sizes)), sizes) + rng.random(n_paths)) / len(sizes)
+        z = norm.ppf(u)
+    elif method == "plain":
+        z = rng.normal(0, 1, size=n_paths)
+    else:
+        raise ValueError(f"unknown sampling method: {method}")
+    return S0 * np.exp((mu - 0.5 * sigma**2) * T + sigma * np.sqrt(T) * z)
+
+def price_option(payoff, S0, mu, sigma, T, steps, n_paths, method="plain", strata=100, rng=None, **kwargs):
+    """Discounted price and standard error; payoffs on S_T alone skip the time grid"""
+    if getattr(payoff, "path_dependent", True):
+        if method != "plain":
+            raise ValueError(f"{method} sampling is only available for terminal payoffs")
+        return price_stream(payoff, S0, mu, sigma, T, steps, n_paths, rng=rng, **kwargs)
+
+    ST = sample_terminal(S0, mu, sigma, T, n_paths, method, strata, rng)
+    values = np.exp(-mu * T) * payoff(ST[:, None])
+    if method == "antithetic":
+        # antithetic pairs are the independent samples
+        pairs = values.reshape(2, -1).mean(axis=0)
+        return pairs.mean(), pairs.std(ddof=1) / np.sqrt(len(pairs))
+    if method == "stratified":
+        # strata are equally likely, so the price is the mean of the stratum means
+        sizes = _strata_sizes(n_paths, strata)
+        starts = np.cumsum(sizes) - sizes
+        means = np.add.reduceat(values, starts) / sizes
+        sq = np.add.reduceat((values - np.repeat(means, sizes))**2, starts)
+        var = np.sum(sq / (sizes - 1) / sizes) / len(sizes)**2
+        return means.mean(), np.sqrt(var)
+    return values.mean(), values.std(ddof=1) / np.sqrt(len(values))
+
+def qmc_points(n, d, engine="sobol", rng=None):
+    # scrambled low-discrepancy points in [0, 1)^d; Sobol rounds n up to a power of two
+    if engine == "sobol":
+        return qmc.Sobol(d, scramble=True, seed=rng).random_base2(int(np.ceil(np.log2(n))))
+    if engine == "halton":
+        return qmc.Halton(d, scramble=True, seed=rng).random(n)
+    raise ValueError(f"unknown qmc engine: {engine}")
+
+def _bridge_plan(steps, dt):
+    # Brownian-bridge order: W_T first, then midpoints breadth first, so early
+    # dimensions set the coarse shape of the path; rows are (index, left, right,
+    # left weight, right weight, conditional std)
+    plan = [(steps, 0, 0, 0.0, 0.0, np.sqrt(steps * dt))]
+    queue = [(0, steps)]
+    while queue:
+        l, r = queue.pop(0)
+        if r - l < 2: continue
+        m = (l + r) // 2
+        plan.append((m, l, r, (r - m) / (r - l), (m - l) / (r - l), np.sqrt((m - l) * (r - m) / (r - l) * dt)))
+        queue += [(l, m), (m, r)]
+    return plan
+
+def qmc_gbm_paths(S0, mu, sigma, T, steps, n_paths, engine="sobol", rng=None):
+    """Task 1 (QMC): GBM paths from scrambled low-discrepancy points via a Brownian bridge"""
+    dt = T / steps
+    z = norm.ppf(qmc_points(n_paths, steps, engine, rng))
+    W = np.zeros((len(z), steps + 1))
+    for k, (i, l, r, wl, wr, sd) in enumerate(_bridge_plan(steps, dt)):
+        W[:, i] = wl * W[:, l] + wr * W[:, r] + sd * z[:, k]
+    t = np.arange(steps + 1) * dt
+    return S0 * np.exp((mu - 0.5 * sigma**2) * t + sigma * W)
+
+def price_option_qmc(payoff, S0, mu, sigma, T, steps, n_paths, replicates=16, engine="sobol", rng=None):
+    """Discounted price, standard error and points used, from independently scrambled QMC replicates
+
+    Each replicate gets n_paths // replicates points, which Sobol rounds up to
+    a power of two, so the count returned can differ from n_paths.
+    """
+    rng = np.random.default_rng(rng)
+    n = max(n_paths // replicates, 1)
+    prices = []
+    for _ in range(replicates):
+        if getattr(payoff, "path_dependent", True):
+            paths = qmc_gbm_paths(S0, mu, sigma, T, steps, n, engine, rng)
+        else:
+            # terminal payoffs need a single dimension: S_T from the lognormal law
+            z = norm.ppf(qmc_points(n, 1, engine, rng)[:, 0])
+            paths = (S0 * np.exp((mu - 0.5 * sigma**2) * T + sigma * np.sqrt(T) * z))[:, None]
+        prices.append(np.exp(-mu * T) * payoff(paths).mean())
+    prices = np.array(prices)
+    return prices.mean(), prices.std(ddof=1) / np.sqrt(replicates), replicates * len(paths)
 
 def black_scholes_call(S, K, T, r, sigma):
     """Task 2: Closed-form solution for sanity check"""
@@ -18,32 +166,172 @@ def black_scholes_call(S, K, T, r, sigma):
     d2 = d1 - sigma * np.sqrt(T)
     return S * norm.cdf(d1) - K * np.exp(-r * T) * norm.cdf(d2)
 
+def geometric_asian_call(S0, K, r, sigma, T, steps):
+    """Task 3: closed-form discretely sampled geometric Asian call over the steps + 1 path points"""
+    # log of the geometric mean is normal: mean over t_i of the log price, variance of the mean of W_{t_i}
+    m = np.log(S0) + (r - 0.5 * sigma**2) * T / 2
+    v = sigma**2 * T * (2 * steps + 1) / (6 * (steps + 1))
+    d2 = (m - np.log(K)) / np.sqrt(v)
+    d1 = d2 + np.sqrt(v)
+    return np.exp(-r * T) * (np.exp(m + v / 2) * norm.cdf(d1) - K * norm.cdf(d2))
+
+def _control_estimate(sums, n, control_mean):
+    # optimal-beta control variate from running sums of y, c, y^2, c^2 and y*c
+    sy, sc, syy, scc, syc = sums
+    var_c = scc / n - (sc / n)**2
+    cov = syc / n - sy * sc / n**2
+    beta = cov / var_c if var_c > 0 else 0.0
+    var = max(syy / n - (sy / n)**2 - beta * cov, 0.0) * n / max(n - 1, 1)
+    return sy / n - beta * (sc / n - control_mean), np.sqrt(var / n)
+
+def price_asian_call_cv(S0, K, mu, sigma, T, steps, n_paths, block_size=10000, rng=None):
+    """Task 3 (control variate): arithmetic Asian call corrected by the closed-form geometric Asian"""
+    df = np.exp(-mu * T)
+    sums = np.zeros(5)
+    for block in iter_gbm_paths(S0, mu, sigma, T, steps, n_paths, block_size, rng=rng):
+        y = df * np.maximum(block.mean(axis=1) - K, 0)
+        c = df * np.maximum(np.exp(np.log(block).mean(axis=1)) - K, 0)
+        sums += [y.sum(), c.sum(), y @ y, c @ c, y @ c]
+    return _control_estimate(sums, n_paths, geometric_asian_call(S0, K, mu, sigma, T, steps))
+
+# S_T quantiles tried as control strikes when none is given
+CONTROL_QUANTILES = (0.5, 0.6, 0.7, 0.8, 0.9, 0.95, 0.99)
+
+def price_terminal_cv(payoff, S0, mu, sigma, T, n_paths, control_strike=None, rng=None):
+    """Task 2 (control variate): terminal payoff corrected by a call whose price black_scholes_call knows
+
+    With no control_strike, the call is struck at whichever S_T quantile in
+    CONTROL_QUANTILES correlates best with the payoff, so deep out-of-the-money
+    payoffs get a control that finishes in the money on the same paths.
+    """
+    ST = sample_terminal(S0, mu, sigma, T, n_paths, rng=rng)
+    df = np.exp(-mu * T)
+    y = df * payoff(ST[:, None])
+    if control_strike is None:
+        # chosen on the first paths only, which is plenty to rank the candidates
+        head, y_head = ST[:10000], y[:10000]
+        strikes = np.quantile(head, CONTROL_QUANTILES)
+        calls = np.maximum(head[None, :] - strikes[:, None], 0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = np.nan_to_num([np.corrcoef(y_head, call)[0, 1] for call in calls])
+        control_strike = strikes[np.argmax(corr)]
+    Kc = control_strike
+    c = df * np.maximum(ST - Kc, 0)
+    sums = [y.sum(), c.sum(), y @ y, c @ c, y @ c]
+    return _control_estimate(sums, n_paths, black_scholes_call(S0, Kc, T, mu, sigma))
+
+def price_terminal_is(payoff, S0, mu, sigma, T, n_paths, shift=None, K=None, rng=None):
+    """Task 2 (importance sampling): normal draws shifted by `shift`, reweighted by the likelihood ratio
+
+    With no shift given, a strike K centres S_T on K, which suits deep out-of-the-money calls.
+    """
+    rng = np.random.default_rng(rng)
+    if shift is None:
+        shift = 0.0 if K is None else (np.log(K / S0) - (mu - 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
+    z = rng.normal(shift, 1, size=n_paths)
+    ST = S0 * np.exp((mu - 0.5 * sigma**2) * T + sigma * np.sqrt(T) * z)
+    values = np.exp(-mu * T) * payoff(ST[:, None]) * np.exp(-shift * z + 0.5 * shift**2)
+    return values.mean(), values.std(ddof=1) / np.sqrt(n_paths)
+
+def variance_reduction_report(S0, K, mu, sigma, T, steps, n_paths, otm_strike=None, rng=None):
+    """Task 5: every estimator at the same n_paths, with its effective speedup over plain MC
+
+    Speedup is (plain variance * plain time) / (method variance * method time),
+    i.e. how many times faster the method reaches a given standard error.
+    """
+    rng = np.random.default_rng(rng)
+    otm_strike = otm_strike or 1.5 * S0
+    call, otm_call = european_call(K), european_call(otm_strike)
+    cases = {
+        "european": [
+            ("plain", lambda: price_option(call, S0, mu, sigma, T, steps, n_paths, rng=rng)),
+            ("antithetic", lambda: price_option(call, S0, mu, sigma, T, steps, n_paths, "antithetic", rng=rng)),
+            ("stratified", lambda: price_option(call, S0, mu, sigma, T, steps, n_paths, "stratified", rng=rng)),
+        ],
+        "asian": [
+            ("plain", lambda: price_option(asian_call(K), S0, mu, sigma, T, steps, n_paths, rng=rng)),
+            ("geometric control", lambda: price_asian_call_cv(S0, K, mu, sigma, T, steps, n_paths, rng=rng)),
+        ],
+        "deep otm": [
+            ("plain", lambda: price_option(otm_call, S0, mu, sigma, T, steps, n_paths, rng=rng)),
+            ("bs control", lambda: price_terminal_cv(otm_call, S0, mu, sigma, T, n_paths, rng=rng)),
+            ("importance", lambda: price_terminal_is(otm_call, S0, mu, sigma, T, n_paths, K=otm_strike, rng=rng)),
+        ],
+    }
+    report = {}
+    for case, methods in cases.items():
+        results = []
+        for name, run in methods:
+            start = time.perf_counter()
+            price, se = run()
+            results.append((name, price, se, time.perf_counter() - start))
+        _, _, se0, t0 = results[0]
+        report[case] = [(name, price, se, se0**2 * t0 / (se**2 * t) if se > 0 else np.inf)
+                        for name, price, se, t in results]
+    return report
+
+def _continuation_fit(X, Y, K):
+    """Regression of discounted cash flow on [1, x, x^2] via 3x3 normal equations on x = S/K"""
+    x = X / K
+    x2 = x * x
+    # power sums give X'X and X'Y without building the design matrix
+    s1, s2, s3, s4 = x.sum(), x2.sum(), (x2 * x).sum(), (x2 * x2).sum()
+    XtX = np.array([[len(x), s1, s2], [s1, s2, s3], [s2, s3, s4]])
+    XtY = np.array([Y.sum(), Y @ x, Y @ x2])
+    # degenerate prices (e.g. sigma ~ 0) make X'X singular: fall back to least squares
+    if np.linalg.cond(XtX) < 1e12:
+        c0, c1, c2 = np.linalg.solve(XtX, XtY)
+    else:
+        c0, c1, c2 = np.linalg.lstsq(np.column_stack([np.ones_like(x), x, x2]), Y, rcond=None)[0]
+    return c0 + c1 * x + c2 * x2
+
+def _ls_backward_step(S_t, cash_flows, K, df):
+    # one Longstaff-Schwartz step: cash_flows go from values at t+1 to values at t
+    itm = np.where(S_t < K)[0]
+    if len(itm) < 3: return
+
+    X = S_t[itm]
+    Y = cash_flows[itm] * df
+
+    # Regression: Continuation Value ~ c0 + c1*S + c2*S^2
+    continuation_val = _continuation_fit(X, Y, K)
+
+    exercise_val = K - X
+    exercise_now = exercise_val > continuation_val
+    cash_flows[itm[exercise_now]] = exercise_val[exercise_now]
+
+    not_exercised = np.ones(len(S_t), dtype=bool)
+    not_exercised[itm[exercise_now]] = False
+    cash_flows[not_exercised] *= df
+
 def price_american_put_ls(paths, K, r, T):
     """Task 4: Longstaff-Schwartz using Matrix Algebra"""
-    n_paths, n_steps = paths.shape
+    _, n_steps = paths.shape
     dt = T / (n_steps - 1)
     df = np.exp(-r * dt)
     
     cash_flows = np.maximum(K - paths[:, -1], 0)
     
     for t in range(n_steps - 2, 0, -1):
-        itm = np.where(paths[:, t] < K)[0]
-        if len(itm) < 3: continue
-            
-        X = paths[itm, t]
-        Y = cash_flows[itm] * df
-        
-        # Regression: Continuation Value ~ c0 + c1*S + c2*S^2
-        A = np.column_stack([np.ones_like(X), X, X**2])
-        coeffs = np.linalg.lstsq(A, Y, rcond=None)[0]
-        continuation_val = A @ coeffs
-        
-        exercise_val = K - X
-        exercise_now = exercise_val > continuation_val
-        cash_flows[itm[exercise_now]] = exercise_val[exercise_now]
-        
-        not_exercised = np.ones(n_paths, dtype=bool)
-        not_exercised[itm[exercise_now]] = False
-        cash_flows[not_exercised] *= df
-
-    return np.mean(cash_flows * df)
\ No newline at end of file
+        _ls_backward_step(paths[:, t], cash_flows, K, df)
+
+    return np.mean(cash_flows * df)
+
+def price_american_put_ls_bridge(S0, K, r, sigma, T, steps, n_paths, rng=None):
+    """Task 4 (low memory): Longstaff-Schwartz on paths rebuilt backward with a Brownian bridge"""
+    rng = np.random.default_rng(rng)
+    dt = T / steps
+    df = np.exp(-r * dt)
+    drift = r - 0.5 * sigma**2
+
+    # only the current Brownian slice is held: W_T first, then W_{t-1} | W_t, W_0 = 0
+    W = rng.normal(0, np.sqrt(T), size=n_paths)
+    cash_flows = np.maximum(K - S0 * np.exp(drift * T + sigma * W), 0)
+
+    for t in range(steps, 1, -1):
+        W *= (t - 1) / t
+        W += rng.normal(0, np.sqrt(dt * (t - 1) / t), size=n_paths)
+        S_t = S0 * np.exp(drift * (t - 1) * dt + sigma * W)
+        _ls_backward_step(S_t, cash_flows, K, df)
+
+    return np.mean(cash_flows * df)
@@ -3,11 +3,18 @@ import matplotlib.pyplot as plt
 from task_logic import get_simulation_data, get_pi_task, get_parabola_task, get_gaussian_task, estimate_e
 
 def plot_convergence(n_values, estimates, errors, true_val, title, filename):
+    # replicated sweeps are (replications, len(n_values)): plot the median with a 5-95% band
+    bands = np.ndim(estimates) == 2
+    if bands:
+        est_lo, estimates, est_hi = np.percentile(estimates, [5, 50, 95], axis=0)
+        err_lo, errors, err_hi = np.percentile(errors, [5, 50, 95], axis=0)
+
     plt.figure(figsize=(12, 5))
     
     # value convergence plot
     plt.subplot(1, 2, 1)
     plt.semilogx(n_values, estimates, '-o', markersize=4, alpha=0.7, label='Estimate')
+    if bands: plt.fill_between(n_values, est_lo, est_hi, alpha=0.2, label='5-95% Band')
     plt.axhline(y=true_val, color='r', linestyle='--', label='True Value')
     plt.xlabel('N (Log Scale)')
     plt.ylabel('Value')
@@ -17,6 +24,7 @@ def plot_convergence(n_values, estimates, errors, true_val, title, filename):
     # log-log error analysis
     plt.subplot(1, 2, 2)
     plt.loglog(n_values, errors, '-s', markersize=4, color='orange', label='Actual Error')
+    if bands: plt.fill_between(n_values, err_lo, err_hi, color='orange', alpha=0.2, label='5-95% Band')
     plt.loglog(n_values, 100/np.sqrt(n_values), color='gray', linestyle=':', label=r'$1/\sqrt{N}$ Trend')
     plt.xlabel('N (Log Scale)')
     plt.ylabel('Error (%)')
@@ -27,27 +35,33 @@ def plot_convergence(n_values, estimates, errors, true_val, title, filename):
     plt.savefig(filename)
     plt.close()
 
-def run_assignments():
+def run_assignments(seed=None):
     n_values = np.geomspace(10, 10**6, 40).astype(int)
-    tasks = [get_pi_task(), get_parabola_task(), get_gaussian_task()]
+    # one independent stream per task, all reproducible from seed
+    streams = np.random.SeedSequence(seed).spawn(4)
+    tasks = [get_pi_task(streams[0]), get_parabola_task(streams[1]), get_gaussian_task(streams[2])]
 
     # run and plot standard MC tasks
     for task in tasks:
         print(f"--- {task['name']} ---")
-        estimates, errors = get_simulation_data(task['sim'], task['true_val'], n_values)
+        estimates, errors = get_simulation_data(task['sim'], task['true_val'], n_values, replications=10)
         
-        final_estimate = task['sim'].estimate(10**7)
-        print(f"Estimate:       {final_estimate:.8f}")
+        final_estimate, std_err, n_used = task['sim'].estimate_to_tolerance(5e-4)
+        print(f"Estimate:       {final_estimate:.8f} (± {std_err:.8f}, N = {n_used})")
         print(f"True Value:     {task['true_val']:.8f}")
-        print(f"Absolute Error: {abs(final_estimate - task['true_val']):.8f}\n")
+        print(f"Absolute Error: {abs(final_estimate - task['true_val']):.8f}")
+
+        # same integral from scrambled Sobol points, 16 replicates for the error bar
+        qmc_estimate, qmc_err, qmc_n = task['sim'].qmc_estimate(2**18)
+        print(f"QMC Estimate:   {qmc_estimate:.8f} (± {qmc_err:.8f}, N = {qmc_n})\n")
         
         plot_filename = f"{task['name'].lower().replace(' ', '_')}_plot.png"
         plot_convergence(n_values, estimates, errors, task['true_val'], task['name'], plot_filename)
 
     # specific output for e
-    e_estimate = estimate_e()
+    e_estimate, e_err = estimate_e(10**8, rng=streams[3], n_workers=None)
     print(f"--- e Estimation ---")
-    print(f"Estimate:       {e_estimate:.8f}")
+    print(f"Estimate:       {e_estimate:.8f} (± {e_err:.8f})")
     print(f"True Value:     {np.e:.8f}")
     print(f"Absolute Error: {abs(e_estimate - np.e):.8f}")
 
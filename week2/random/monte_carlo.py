@@ -1,16 +1,81 @@
 import numpy as np
+from scipy.stats import norm, qmc
+
+def qmc_points(n, d, engine="sobol", rng=None):
+    """n scrambled low-discrepancy points in [0, 1)^d; Sobol rounds n up to a power of two"""
+    if engine == "sobol":
+        return qmc.Sobol(d, scramble=True, seed=rng).random_base2(int(np.ceil(np.log2(n))))
+    if engine == "halton":
+        return qmc.Halton(d, scramble=True, seed=rng).random(n)
+    raise ValueError(f"unknown qmc engine: {engine}")
 
 class MonteCarloSimulator:
-    def __init__(self, predicate_func, bounds):
+    def __init__(self, predicate_func, bounds, rng=None):
         self.predicate = predicate_func
+        # rng may be a seed, a SeedSequence or a Generator
+        self.rng = np.random.default_rng(rng)
         self.bounds = bounds
         self.box_area = (bounds[1] - bounds[0]) * (bounds[3] - bounds[2])
 
     def estimate(self, N):
-        x = np.random.uniform(self.bounds[0], self.bounds[1], int(N))
-        y = np.random.uniform(self.bounds[2], self.bounds[3], int(N))
+        x = self.rng.uniform(self.bounds[0], self.bounds[1], int(N))
+        y = self.rng.uniform(self.bounds[2], self.bounds[3], int(N))
         
         inside_mask = self.predicate(x, y)
         points_inside = np.sum(inside_mask)
         
-        return (points_inside / N) * self.box_area
\ No newline at end of file
+        return (points_inside / N) * self.box_area
+
+    def prefix_estimates(self, n_values, replications=1, chunk_size=10**6):
+        # one stream per replication up to max(n_values), estimates read off cumulative hit counts
+        n_values = np.asarray(n_values, dtype=np.int64)
+        hits = np.zeros((replications, len(n_values)))
+        count = np.zeros((replications, 1))
+        start, n_max = 0, n_values.max()
+        k = max(chunk_size // replications, 1)
+        while start < n_max:
+            k = min(k, n_max - start)
+            x = self.rng.uniform(self.bounds[0], self.bounds[1], (replications, k))
+            y = self.rng.uniform(self.bounds[2], self.bounds[3], (replications, k))
+            cum = np.cumsum(self.predicate(x, y), axis=1) + count
+
+            in_chunk = (n_values > start) & (n_values <= start + k)
+            hits[:, in_chunk] = cum[:, n_values[in_chunk] - start - 1]
+            count = cum[:, -1:]
+            start += k
+        return hits / n_values * self.box_area
+
+    def estimate_to_tolerance(self, rel_err, confidence=0.95, chunk_size=10**5, max_samples=10**9):
+        # sample in chunks until the confidence half-width is within rel_err of the estimate
+        z = norm.ppf(0.5 + confidence / 2)
+        n, mean, m2 = 0, 0.0, 0.0
+        while n < max_samples:
+            k = min(chunk_size, max_samples - n)
+            x = self.rng.uniform(self.bounds[0], self.bounds[1], k)
+            y = self.rng.uniform(self.bounds[2], self.bounds[3], k)
+            values = self.predicate(x, y) * self.box_area
+
+            # merge the chunk into the running Welford mean and sum of squared deviations
+            chunk_mean = values.mean()
+            chunk_m2 = np.sum((values - chunk_mean)**2)
+            delta = chunk_mean - mean
+            total = n + k
+            mean += delta * k / total
+            m2 += chunk_m2 + delta**2 * n * k / total
+            n = total
+
+            std_err = np.sqrt(m2 / (n - 1) / n) if n > 1 else np.inf
+            if z * std_err <= rel_err * abs(mean): break
+        return mean, std_err, n
+
+    def qmc_estimate(self, N, replicates=16, engine="sobol"):
+        # independently scrambled replicates of N // replicates points each; their spread gives the error bar
+        lo = np.array([self.bounds[0], self.bounds[2]])
+        hi = np.array([self.bounds[1], self.bounds[3]])
+        values = []
+        for _ in range(replicates):
+            u = qmc.scale(qmc_points(max(N // replicates, 1), 2, engine, self.rng), lo, hi)
+            values.append(self.predicate(u[:, 0], u[:, 1]).mean() * self.box_area)
+        values = np.array(values)
+        n = replicates * len(u)
+        return values.mean(), values.std(ddof=1) / np.sqrt(replicates), n
@@ -1,38 +1,76 @@
 import numpy as np
+import multiprocessing as mp
+import os
 from scipy.special import erf
 from monte_carlo import MonteCarloSimulator
 
-# generates estimates and error percentages for a given simulator
-def get_simulation_data(sim, true_val, n_values):
-    estimates = [sim.estimate(n) for n in n_values]
-    errors = [(abs(e - true_val) / true_val) * 100 for e in estimates]
-    return np.array(estimates), np.array(errors)
+# generates estimates and error percentages for a given simulator, taking every
+# n in n_values as a prefix of one sample stream per replication
+def get_simulation_data(sim, true_val, n_values, replications=1):
+    estimates = sim.prefix_estimates(n_values, replications)
+    errors = (np.abs(estimates - true_val) / true_val) * 100
+    if replications == 1:
+        return estimates[0], errors[0]
+    return estimates, errors
 
-def get_pi_task():
+def get_pi_task(rng=None):
     return {
         "name": "Circle (Pi)",
-        "sim": MonteCarloSimulator(lambda x, y: (x**2 + y**2) <= 1, [-1, 1, -1, 1]),
+        "sim": MonteCarloSimulator(lambda x, y: (x**2 + y**2) <= 1, [-1, 1, -1, 1], rng),
         "true_val": np.pi
     }
 
-def get_parabola_task():
+def get_parabola_task(rng=None):
     return {
         "name": "Parabola",
-        "sim": MonteCarloSimulator(lambda x, y: y < x**2, [0, 2, 0, 4]),
+        "sim": MonteCarloSimulator(lambda x, y: y < x**2, [0, 2, 0, 4], rng),
         "true_val": 8/3
     }
 
-def get_gaussian_task():
+def get_gaussian_task(rng=None):
     return {
         "name": "Gaussian",
-        "sim": MonteCarloSimulator(lambda x, y: y < np.exp(-x**2), [0, 2, 0, 1]),
+        "sim": MonteCarloSimulator(lambda x, y: y < np.exp(-x**2), [0, 2, 0, 1], rng),
         "true_val": (np.sqrt(np.pi)/2) * erf(2)
     }
 
+def _seed_sequence(rng):
+    # chunks need independent seeds: accept a SeedSequence, a seed or a Generator
+    if isinstance(rng, np.random.SeedSequence): return rng
+    if isinstance(rng, np.random.Generator): return np.random.SeedSequence(int(rng.integers(2**63)))
+    return np.random.SeedSequence(rng)
+
+def _e_chunk(n, seed_seq):
+    # length of the initial decreasing run plus the draw that ends it, for n trials;
+    # only trials still decreasing draw again, so no fixed cap on the length
+    rng = np.random.default_rng(seed_seq)
+    prev = rng.random(n)
+    length = np.ones(n, dtype=np.int64)
+    active = np.arange(n)
+    while len(active):
+        u = rng.random(len(active))
+        length[active] += 1
+        going = u < prev
+        active, prev = active[going], u[going]
+    return length.sum(), (length * length).sum()
+
 # estimates e using the expected length of decreasing sequences
-def estimate_e(num_tests=10**6):
-    u = np.random.rand(num_tests, 10)
-    is_decreasing = u[:, :-1] > u[:, 1:]
-    decreasing_chain = np.cumprod(is_decreasing, axis=1)
-    n_values = np.sum(decreasing_chain, axis=1) + 2
-    return np.mean(n_values)
\ No newline at end of file
+def estimate_e(num_tests=10**6, rng=None, chunk_size=10**6, n_workers=1):
+    """Returns (estimate, standard error); chunks run on n_workers processes (None for all cores).
+
+    Every chunk has its own SeedSequence child, so the result does not depend on n_workers.
+    """
+    sizes = [min(chunk_size, num_tests - start) for start in range(0, num_tests, chunk_size)]
+    jobs = list(zip(sizes, _seed_sequence(rng).spawn(len(sizes))))
+    n_workers = min(n_workers or os.cpu_count(), len(jobs))
+    if n_workers == 1:
+        parts = [_e_chunk(*job) for job in jobs]
+    else:
+        with mp.get_context("spawn").Pool(n_workers) as pool:
+            parts = pool.starmap(_e_chunk, jobs)
+
+    total = sum(int(p[0]) for p in parts)
+    total_sq = sum(int(p[1]) for p in parts)
+    mean = total / num_tests
+    var = (total_sq - num_tests * mean ** 2) / (num_tests - 1)
+    return mean, np.sqrt(var / num_tests)
@@ -1,98 +1,102 @@
-import random
+import numpy as np
+from hand_tables import HAND_ADD, HAND_VALUE, AUTO_HIT, STATES, CARDS
+from dealer_odds import STAND_EV, stand_ev, dealer_distribution_count, true_count, dealer_distribution_shoe
+
+# 6-deck shoe for statistical stationarity
+SHOE = [2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 11] * 4 * 6
+
+DEALER_MODES = ("sample", "exact", "shoe", "shoe-exact")
 
 class BlackjackEnv:
-    def __init__(self):
+    def __init__(self, seed=None, dealer_mode="sample"):
+        if dealer_mode not in DEALER_MODES:
+            raise ValueError(f"unknown dealer_mode {dealer_mode!r}, expected one of {DEALER_MODES}")
+        # own shuffle stream: seed may be an int, a SeedSequence or a Generator
+        self.rng = np.random.default_rng(seed)
+        # "sample" plays the dealer out; "exact" and "shoe" pay the expected reward of
+        # standing instead, against an infinite deck or the current shoe composition
+        # (through its Hi-Lo true count, so the dealer tables stay cached); "shoe-exact"
+        # uses the exact unseen cards but costs milliseconds a hand, so it is for evaluation only
+        self.dealer_mode = dealer_mode
         self.deck = []
         self.reset_deck()
 
     def reset_deck(self):
-        # 6-deck shoe for statistical stationarity
-        self.deck = [2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 11] * 4 * 6
-        random.shuffle(self.deck)
+        self.deck = self.rng.permutation(SHOE).tolist()
+        # cards left per value 2..11, kept in step with draw
+        self.counts = [SHOE.count(card) for card in CARDS]
 
     def draw(self):
         if len(self.deck) < 15: self.reset_deck()
-        return self.deck.pop()
-
-    def get_hand_value(self, hand):
-        val = sum(hand)
-        aces = hand.count(11)
-        while val > 21 and aces:
-            val -= 10
-            aces -= 1
-        return val
+        card = self.deck.pop()
+        self.counts[card - 2] -= 1
+        return card
 
-    def get_state(self, hand, d_card):
-        p_sum = self.get_hand_value(hand)
-        usable_ace = (hand.count(11) > 0 and (p_sum <= 21))
-        is_pair = len(hand) == 2 and hand[0] == hand[1]
-        return (p_sum, d_card, usable_ace, is_pair)
+    def get_state(self):
+        return STATES[self.player][self.d_card][self.is_pair]
 
     def reset(self, force_player_sum=None):
-        self.dealer_hand = [self.draw(), self.draw()]
-        if force_player_sum == 5: 
-            self.player_hand = [2, 3]
-        elif force_player_sum == 21: 
-            self.player_hand = [11, 10]
-        else: 
-            self.player_hand = [self.draw(), self.draw()]
-        return self.get_state(self.player_hand, self.dealer_hand[0])
+        self.d_card, self.hole = self.draw(), self.draw()
+        self.dealer = HAND_ADD[HAND_ADD[0][self.d_card]][self.hole]
+        if force_player_sum == 5:
+            c1, c2 = 2, 3
+        elif force_player_sum == 21:
+            c1, c2 = 11, 10
+        else:
+            c1, c2 = self.draw(), self.draw()
+        # first two cards are kept for splitting
+        self.first, self.second = c1, c2
+        self.player = HAND_ADD[HAND_ADD[0][c1]][c2]
+        self.is_pair = c1 == c2
+        return self.get_state()
 
     def step(self, action):
-        d_card = self.dealer_hand[0]
+        d_card = self.d_card
         if action == 1: # hit
-            self.player_hand.append(self.draw())
-            if self.get_hand_value(self.player_hand) > 21:
-                return self.get_state(self.player_hand, d_card), -1, True
-            return self.get_state(self.player_hand, d_card), 0, False
-        
+            self.player = HAND_ADD[self.player][self.draw()]
+            self.is_pair = False
+            if HAND_VALUE[self.player] > 21:
+                return self.get_state(), -1, True
+            return self.get_state(), 0, False
+
         elif action == 2: # double down
-            self.player_hand.append(self.draw())
-            p_val = self.get_hand_value(self.player_hand)
+            self.player = HAND_ADD[self.player][self.draw()]
+            self.is_pair = False
+            p_val = HAND_VALUE[self.player]
             reward = -2 if p_val > 21 else self.play_dealer(p_val) * 2
-            return self.get_state(self.player_hand, d_card), reward, True
-        
+            return self.get_state(), reward, True
+
         elif action == 3: # split
-            c1, c2 = self.player_hand[0], self.player_hand[1]
             # resolve split hands with improved proxy
-            r1 = self.auto_resolve([c1, self.draw()], d_card)
-            r2 = self.auto_resolve([c2, self.draw()], d_card)
-            return self.get_state(self.player_hand, d_card), r1 + r2, True
-        
+            r1 = self.auto_resolve(HAND_ADD[HAND_ADD[0][self.first]][self.draw()], d_card)
+            r2 = self.auto_resolve(HAND_ADD[HAND_ADD[0][self.second]][self.draw()], d_card)
+            return self.get_state(), r1 + r2, True
+
         else: # stand
-            reward = self.play_dealer(self.get_hand_value(self.player_hand))
-            return self.get_state(self.player_hand, d_card), reward, True
+            reward = self.play_dealer(HAND_VALUE[self.player])
+            return self.get_state(), reward, True
 
     def auto_resolve(self, hand, d_card):
-        # proxy strategy refined to match basic strategy chart
-        while True:
-            val = self.get_hand_value(hand)
-            is_soft = (11 in hand) and (sum(hand) <= 21)
-            
-            if val > 21: break 
-
-            # logic for soft totals (ace involved)
-            if is_soft:
-                if val <= 17: # hit soft 17 or less
-                    hand.append(self.draw())
-                    continue
-                if val == 18 and d_card in [9, 10, 11]: # hit soft 18 vs strong dealer
-                    hand.append(self.draw())
-                    continue
-                break # stand on soft 18+ otherwise
-
-            # logic for hard totals
-            if val >= 17: break
-            if 12 <= val <= 16 and 2 <= d_card <= 6: break
-            
-            hand.append(self.draw())
-            
-        p_val = self.get_hand_value(hand)
+        while AUTO_HIT[hand][d_card]:
+            hand = HAND_ADD[hand][self.draw()]
+        p_val = HAND_VALUE[hand]
         return -1 if p_val > 21 else self.play_dealer(p_val)
 
+    def shoe_counts(self):
+        # cards the player cannot see: the rest of the shoe plus the hole card
+        counts = list(self.counts)
+        counts[self.hole - 2] += 1
+        return tuple(counts)
+
     def play_dealer(self, p_val):
-        while self.get_hand_value(self.dealer_hand) < 17:
-            self.dealer_hand.append(self.draw())
-        d_val = self.get_hand_value(self.dealer_hand)
+        if self.dealer_mode == "exact":
+            return STAND_EV[self.d_card][p_val]
+        if self.dealer_mode == "shoe":
+            return stand_ev(p_val, dealer_distribution_count(self.d_card, true_count(self.shoe_counts())))
+        if self.dealer_mode == "shoe-exact":
+            return stand_ev(p_val, dealer_distribution_shoe(self.d_card, self.shoe_counts()))
+        while HAND_VALUE[self.dealer] < 17:
+            self.dealer = HAND_ADD[self.dealer][self.draw()]
+        d_val = HAND_VALUE[self.dealer]
         if d_val > 21 or p_val > d_val: return 1
-        return -1 if p_val < d_val else 0
\ No newline at end of file
+        return -1 if p_val < d_val else 0
@@ -0,0 +1,90 @@
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+
+# a checkpoint directory holds ckpt-<episode>/ folders of .npy tables plus meta.json,
+# and a LATEST file naming the newest complete one
+LATEST = "LATEST"
+
+def save_checkpoint(directory, tables, meta, keep=2):
+    """Write tables (name -> array) and JSON-able meta as a new checkpoint.
+
+    Files are written into a temporary folder that is renamed into place, and
+    LATEST is swapped with os.replace, so a crash never leaves a half-written
+    checkpoint behind LATEST.
+    """
+    os.makedirs(directory, exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix=".tmp-", dir=directory)
+    for name, table in tables.items():
+        table = np.asarray(table)
+        out = np.lib.format.open_memmap(os.path.join(tmp, f"{name}.npy"), mode="w+",
+                                        dtype=table.dtype, shape=table.shape)
+        out[...] = table
+        out.flush()
+        del out
+    with open(os.path.join(tmp, "meta.json"), "w") as f:
+        json.dump(meta, f)
+
+    name = f"ckpt-{meta['episode']:012d}"
+    final = os.path.join(directory, name)
+    if os.path.exists(final): shutil.rmtree(final)
+    os.rename(tmp, final)
+
+    pointer = os.path.join(directory, LATEST + ".tmp")
+    with open(pointer, "w") as f:
+        f.write(name)
+    os.replace(pointer, os.path.join(directory, LATEST))
+
+    # drop older checkpoints beyond the newest keep
+    old = sorted(d for d in os.listdir(directory) if d.startswith("ckpt-"))[:-keep]
+    for d in old:
+        shutil.rmtree(os.path.join(directory, d))
+
+def load_checkpoint(directory):
+    """(tables, meta) from the newest checkpoint, tables memory-mapped read-only; None if there is none."""
+    pointer = os.path.join(directory, LATEST)
+    if not os.path.exists(pointer): return None
+    with open(pointer) as f:
+        path = os.path.join(directory, f.read().strip())
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+    tables = {name[:-4]: np.load(os.path.join(path, name), mmap_mode="r")
+              for name in os.listdir(path) if name.endswith(".npy")}
+    return tables, meta
+
+def stream_state(env, rng):
+    # everything needed to continue the env's shoe and the agent's RandomBuffer exactly
+    tables = {"deck": np.array(env.deck, dtype=np.int64), "counts": np.array(env.counts, dtype=np.int64),
+              "agent_buffer": np.array(rng.buffer)}
+    meta = {"env_rng": env.rng.bit_generator.state, "agent_rng": rng.rng.bit_generator.state}
+    return tables, meta
+
+def restore_stream_state(env, rng, tables, meta):
+    env.deck = tables["deck"].tolist()
+    if "counts" in tables:
+        env.counts = tables["counts"].tolist()
+    else:
+        # checkpoints from before counts were saved: recount the deck, cards 2..11
+        env.counts = np.bincount(tables["deck"], minlength=12)[2:].tolist()
+    env.rng.bit_generator.state = meta["env_rng"]
+    rng.buffer = tables["agent_buffer"].tolist()
+    rng.rng.bit_generator.state = meta["agent_rng"]
+
+def resume_training(checkpoint_dir, episodes, env, rng, tables):
+    """Restore tables (name -> array, filled in place), env and rng from the newest checkpoint.
+
+    Returns (first episode to run, checkpoint meta), or (1, None) when there
+    is no checkpoint to resume from.
+    """
+    ckpt = load_checkpoint(checkpoint_dir) if checkpoint_dir else None
+    if not ckpt: return 1, None
+    saved, meta = ckpt
+    if meta["episodes"] != episodes:
+        raise ValueError(f"checkpoint belongs to a {meta['episodes']}-episode run, not {episodes}")
+    for name, table in tables.items():
+        table[:] = saved[name]
+    restore_stream_state(env, rng, saved, meta)
+    print(f"Resuming from episode {meta['episode']}.")
+    return meta["episode"] + 1, meta
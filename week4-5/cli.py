@@ -0,0 +1,113 @@
+import argparse
+import numpy as np
+from state_index import strategy_chart
+
+# headless entry point: train, evaluate and plot without loading a plotting stack
+# unless the plot command asks for it
+#   python cli.py train --agent glie --episodes 2000000 --checkpoint-dir ckpt --output glie.npz
+#   python cli.py evaluate glie.npz --hands 20000000 --compare basic
+#   python cli.py plot glie.npz
+
+AGENTS = ("glie", "glie-parallel", "off-policy", "off-policy-batched")
+# only the per-episode loops checkpoint, resume and stop early
+SEQUENTIAL_AGENTS = ("glie", "off-policy")
+
+def train(args):
+    monitor = None
+    if args.early_stop:
+        from convergence import ConvergenceMonitor
+        monitor = ConvergenceMonitor()
+    checkpointing = dict(checkpoint_dir=args.checkpoint_dir, checkpoint_every=args.checkpoint_every,
+                         resume=args.resume, monitor=monitor)
+
+    if args.agent == "glie":
+        from mc_agent_week4 import run_task_2
+        Q, counts, _ = run_task_2(args.episodes, args.seed, **checkpointing)
+        visited = counts.any(axis=1)
+    elif args.agent == "glie-parallel":
+        from parallel_mc import run_task_2_parallel
+        Q, counts = run_task_2_parallel(args.episodes, args.workers, seed=args.seed)
+        visited = counts.any(axis=1)
+    elif args.agent == "off-policy":
+        from mc_agent_week5 import run_off_policy_task
+        Q, C = run_off_policy_task(args.episodes, args.seed, **checkpointing)
+        visited = C.any(axis=1)
+    else:
+        from mc_agent_week5 import run_off_policy_batched
+        Q, C = run_off_policy_batched(args.episodes, seed=args.seed)
+        visited = C.any(axis=1)
+
+    np.savez(args.output, Q=Q, visited=visited)
+    print(f"'{args.output}' saved.")
+
+def load_policy(source):
+    # a saved .npz from train, or "basic" for the built-in basic strategy chart
+    from house_edge import q_policy, basic_strategy_policy
+    if source == "basic":
+        return basic_strategy_policy()
+    saved = np.load(source)
+    return q_policy(saved["Q"], saved["visited"])
+
+def evaluate(args):
+    from house_edge import evaluate_policy, print_report, compare_policies, print_comparison
+    policy = load_policy(args.source)
+    mean, se, breakdown = evaluate_policy(policy, args.hands, n_workers=args.workers, seed=args.seed)
+    print_report(mean, se, breakdown, policy)
+
+    if args.compare:
+        names = [args.source] + args.compare
+        policies = [policy] + [load_policy(other) for other in args.compare]
+        results = compare_policies(policies, args.hands, n_workers=args.workers, seed=args.seed)
+        print_comparison(names, *results)
+
+def plot(args):
+    from render import plot_chart
+    if args.source == "basic":
+        from house_edge import basic_strategy_chart
+        chart = basic_strategy_chart()
+    else:
+        saved = np.load(args.source)
+        chart = strategy_chart(saved["Q"], saved["visited"])
+    plot_chart(chart, args.title or args.source, args.output)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Blackjack Monte Carlo control")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("train", help="train an agent and save its Q table")
+    p.add_argument("--agent", choices=AGENTS, default="glie")
+    p.add_argument("--episodes", type=int, default=2000000)
+    p.add_argument("--seed", type=int, default=None)
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--checkpoint-dir", default=None)
+    p.add_argument("--checkpoint-every", type=int, default=100000)
+    p.add_argument("--resume", action="store_true")
+    p.add_argument("--early-stop", action="store_true")
+    p.add_argument("--output", default="q_table.npz")
+    p.set_defaults(run=train)
+
+    p = commands.add_parser("evaluate", help="estimate the expected return of a strategy")
+    p.add_argument("source", help="a .npz from train, or 'basic'")
+    p.add_argument("--hands", type=int, default=10000000)
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--compare", nargs="+", default=[], help="strategies to compare on the same hands")
+    p.set_defaults(run=evaluate)
+
+    p = commands.add_parser("plot", help="render a strategy chart")
+    p.add_argument("source", help="a .npz from train, or 'basic'")
+    p.add_argument("--title", default=None)
+    p.add_argument("--output", default="strategy.png")
+    p.set_defaults(run=plot)
+
+    args = parser.parse_args(argv)
+    if args.command == "train" and args.agent not in SEQUENTIAL_AGENTS:
+        used = [flag for flag, on in (("--checkpoint-dir", args.checkpoint_dir), ("--resume", args.resume),
+                                      ("--early-stop", args.early_stop)) if on]
+        if used:
+            parser.error(f"{', '.join(used)} not supported for --agent {args.agent}; "
+                         f"use one of {', '.join(SEQUENTIAL_AGENTS)}")
+    args.run(args)
+
+if __name__ == "__main__":
+    main()
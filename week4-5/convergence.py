@@ -0,0 +1,124 @@
+import numpy as np
+from state_index import make_table, chart_index, decode_states, greedy_action, strategy_chart, LEGAL_MASKS
+
+# the widest gap two action values can have, rewards being in [-2, 2]
+MAX_GAP = 4.0
+
+class ConvergenceMonitor:
+    """Decides when control training can stop early.
+
+    Returns are accumulated per (state, action) as they are used for updates,
+    with an optional importance weight, so each Q gets a standard error from
+    its effective sample size. Every `window` episodes check() compares the
+    strategy chart with the previous window and bounds, per chart cell, how
+    much the greedy action can trail the runner-up: the runner-up's upper
+    z-bound minus the greedy action's lower one. Other legal actions are
+    ignored, and a runner-up that got fewer than `min_visits` returns over the
+    window counts by its point estimate, since exploration starves it as
+    epsilon decays and its interval would never shrink. Training is done once,
+    for `patience` windows, no cell has flipped to an action more than
+    `tolerance` better, and these bounds weighted by how often each cell
+    comes up, the chart's plausible loss per hand, are under `max_loss`.
+    """
+
+    def __init__(self, window=10000, patience=5, z=1.96, tolerance=0.05, min_visits=30, max_loss=0.002):
+        self.window = window
+        self.patience = patience
+        self.z = z
+        self.tolerance = tolerance
+        self.min_visits = min_visits
+        self.max_loss = max_loss
+
+        # weighted sums: w, w^2, w*G, w*G^2, and plain visit counts; observations
+        # are queued as (s, a, G, w) and folded in with bincount when a check needs them
+        self.pending = []
+        self.sw = make_table()
+        self.sw2 = make_table()
+        self.swg = make_table()
+        self.swg2 = make_table()
+        self.visits = make_table()
+
+        self.idx = chart_index().ravel()
+        self.masks = LEGAL_MASKS[1 + decode_states(self.idx)[:, 3]]
+        self.chart = None
+        self.last_n_eff = np.zeros((len(self.idx), self.sw.shape[1]))
+        self.stable = 0
+        self.flips = []
+        self.open_cells = len(self.idx)
+        self.loss = np.inf
+        self.stopped_at = None
+
+    def observe(self, s, a, G, w=1.0):
+        self.pending.append((s, a, G, w))
+
+    def _flush(self):
+        if not self.pending: return
+        s, a, G, w = np.array(self.pending).T
+        self.pending = []
+        sa = s.astype(np.int64) * self.sw.shape[1] + a.astype(np.int64)
+        for table, weights in ((self.sw, w), (self.sw2, w * w), (self.swg, w * G), (self.swg2, w * G * G),
+                               (self.visits, None)):
+            table += np.bincount(sa, weights=weights, minlength=table.size).reshape(table.shape)
+
+    def intervals(self):
+        # weighted mean, its standard error and the effective sample size (sum w)^2 / sum w^2
+        self._flush()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = self.swg / self.sw
+            n_eff = self.sw ** 2 / self.sw2
+            var = np.maximum(self.swg2 / self.sw - mean ** 2, 0.0) * n_eff / (n_eff - 1)
+            se = np.sqrt(var / n_eff)
+        return mean, se, np.nan_to_num(n_eff)
+
+    def regret(self, Q):
+        """Per chart cell, how much the greedy action can trail the runner-up at confidence z.
+
+        Meant to be called once per window: runner-ups are judged starved by their
+        returns since the previous call.
+        """
+        _, se, n_eff = self.intervals()
+        rows = np.arange(len(self.idx))
+        q, se, n_eff = Q[self.idx], np.nan_to_num(se[self.idx]), n_eff[self.idx]
+        best = greedy_action(q, self.masks)
+        others = self.masks & (np.arange(Q.shape[1]) != best[:, None])
+        runner = greedy_action(q, others)
+
+        # a runner-up under min_visits new returns since the last check is starved: point estimate
+        fed = n_eff[rows, runner] - self.last_n_eff[rows, runner] >= self.min_visits
+        self.last_n_eff = n_eff
+
+        lower = q[rows, best] - self.z * se[rows, best]
+        upper = q[rows, runner] + self.z * se[rows, runner] * fed
+        return np.where(n_eff[rows, best] >= self.min_visits, np.maximum(upper - lower, 0.0), MAX_GAP)
+
+    def check(self, episode, Q):
+        """Record the window ending at episode; True once training can stop."""
+        chart = strategy_chart(Q).ravel()
+        if self.chart is None:
+            flipped = relevant = np.ones(len(chart), dtype=bool)
+        else:
+            # flips between actions within tolerance of each other are near-ties, not instability
+            flipped = chart != self.chart
+            q = Q[self.idx]
+            rows = np.arange(len(chart))
+            relevant = flipped & (q[rows, chart] - q[rows, self.chart] > self.tolerance)
+        self.chart = chart
+        self.flips.append(int(flipped.sum()))
+        self.stable = 0 if relevant.any() else self.stable + 1
+
+        # cells weighted by their share of the episodes seen, which after a resume start at the resume
+        regret = self.regret(Q)
+        share = self.visits[self.idx].sum(axis=1) / (len(self.flips) * self.window)
+        self.loss = float(share @ regret)
+        self.open_cells = int((regret > self.tolerance).sum())
+        if self.stable < self.patience or self.loss > self.max_loss: return False
+        self.stopped_at = episode
+        return True
+
+    def report(self, episodes):
+        if self.stopped_at is None:
+            return (f"No early stop in {episodes} episodes: last window flipped {self.flips[-1] if self.flips else 0} "
+                    f"cells, plausible loss {self.loss:.4f} per hand, {self.open_cells} cells unresolved.")
+        saved = episodes - self.stopped_at
+        return (f"Converged at episode {self.stopped_at} (plausible loss {self.loss:.4f} per hand), "
+                f"saved {saved} episodes ({saved / episodes:.0%}).")
@@ -0,0 +1,108 @@
+import numpy as np
+from functools import lru_cache
+from hand_tables import HAND_ADD, HAND_VALUE, CARDS
+
+# dealer final totals in column order; 22 stands for any bust
+FINALS = (17, 18, 19, 20, 21, 22)
+# card probabilities for an infinite deck, indexed by card value 2..11
+INFINITE_DECK = [4 / 13 if card == 10 else 1 / 13 for card in CARDS]
+# default bound on memoized shoe compositions
+SHOE_CACHE_SIZE = 4096
+
+def _frozen(dist):
+    # cached results are shared, so hand them out read-only
+    dist = np.array(dist)
+    dist.setflags(write=False)
+    return dist
+
+def _final_column(code):
+    return min(HAND_VALUE[code], 22) - 17
+
+@lru_cache(maxsize=None)
+def _finish_infinite(code):
+    # dealer draws to 17 from an infinite deck, starting from hand code
+    dist = [0.0] * len(FINALS)
+    if HAND_VALUE[code] >= 17:
+        dist[_final_column(code)] = 1.0
+        return tuple(dist)
+    for card, p in zip(CARDS, INFINITE_DECK):
+        for col, q in enumerate(_finish_infinite(HAND_ADD[code][card])):
+            dist[col] += p * q
+    return tuple(dist)
+
+@lru_cache(maxsize=None)
+def dealer_distribution(upcard):
+    """Final-total distribution over FINALS for an upcard, hole card unknown, infinite deck"""
+    return _frozen(_finish_infinite(HAND_ADD[0][upcard]))
+
+@lru_cache(maxsize=SHOE_CACHE_SIZE)
+def dealer_distribution_shoe(upcard, counts):
+    """Same as dealer_distribution but drawing without replacement from a shoe.
+
+    counts is a tuple of remaining cards per value 2..11, hole card included.
+    """
+    memo = {}
+
+    def finish(code, counts):
+        if HAND_VALUE[code] >= 17:
+            dist = [0.0] * len(FINALS)
+            dist[_final_column(code)] = 1.0
+            return dist
+        key = (code, counts)
+        if key in memo: return memo[key]
+        total = sum(counts)
+        dist = [0.0] * len(FINALS)
+        for i, n in enumerate(counts):
+            if not n: continue
+            rest = counts[:i] + (n - 1,) + counts[i + 1:]
+            for col, q in enumerate(finish(HAND_ADD[code][i + 2], rest)):
+                dist[col] += n / total * q
+        memo[key] = dist
+        return dist
+
+    return _frozen(finish(HAND_ADD[0][upcard], tuple(counts)))
+
+def true_count(counts):
+    """Hi-Lo true count of a shoe: (tens and aces - cards 2-6) per deck left, rounded."""
+    decks = sum(counts) / 52
+    return round((counts[8] + counts[9] - sum(counts[:5])) / decks)
+
+@lru_cache(maxsize=SHOE_CACHE_SIZE)
+def dealer_distribution_count(upcard, count):
+    """dealer_distribution for a shoe at a Hi-Lo true count.
+
+    The deck is one whose tens and aces are up by count / 2 per 52 cards and
+    whose 2-6 are down by as much; cards are drawn with replacement. Much
+    coarser than dealer_distribution_shoe, but a few dozen keys cover a shoe.
+    """
+    deck = [4 - count / 10 if card <= 6 else 4 + count / 10 if card == 11 else
+            16 + count * 2 / 5 if card == 10 else 4 for card in CARDS]
+    deck = [max(n, 0.0) for n in deck]
+    probs = [n / sum(deck) for n in deck]
+    memo = {}
+
+    def finish(code):
+        if code in memo: return memo[code]
+        dist = [0.0] * len(FINALS)
+        if HAND_VALUE[code] >= 17:
+            dist[_final_column(code)] = 1.0
+        else:
+            for card, p in zip(CARDS, probs):
+                for col, q in enumerate(finish(HAND_ADD[code][card])):
+                    dist[col] += p * q
+        memo[code] = dist
+        return dist
+
+    return _frozen(finish(HAND_ADD[0][upcard]))
+
+def stand_ev(p_val, dist):
+    # expected reward of standing on p_val against a dealer final-total distribution
+    if p_val > 21: return -1.0
+    finals = np.array(FINALS)
+    win = dist[finals == 22].sum() + dist[finals < p_val].sum()
+    lose = dist[(finals > p_val) & (finals <= 21)].sum()
+    return float(win - lose)
+
+# stand_ev per (upcard, player total) for the infinite deck; rows 0 and 1 are unused
+STAND_EV = [[stand_ev(p_val, dealer_distribution(up)) if up in CARDS else 0.0 for p_val in range(22)]
+            for up in range(12)]
@@ -0,0 +1,41 @@
+# a hand is an integer code: value * 8 + soft * 4 + has_ace * 2 + reduced, where soft means
+# an ace still counts as 11 and reduced means an ace has already been cut down to 1
+N_CODES = 32 * 8
+CARDS = range(2, 12)
+
+def hand_code(value, soft, has_ace, reduced):
+    return value * 8 + soft * 4 + has_ace * 2 + reduced
+
+def _add_card(code, card):
+    value, soft, has_ace, reduced = code >> 3, code >> 2 & 1, code >> 1 & 1, code & 1
+    if value > 21: return code # bust hands take no more cards
+    value += card
+    soft += card == 11
+    while value > 21 and soft:
+        value -= 10
+        soft -= 1
+        reduced = 1
+    return hand_code(value, soft, has_ace | (card == 11), reduced)
+
+def _auto_hit(code, d_card):
+    # proxy strategy refined to match basic strategy chart
+    val = HAND_VALUE[code]
+    if val > 21: return False
+    if HAND_SOFT[code]:
+        # hit soft 17 or less, and soft 18 vs strong dealer
+        return val <= 17 or (val == 18 and d_card in [9, 10, 11])
+    # logic for hard totals
+    if val >= 17: return False
+    if 12 <= val <= 16 and 2 <= d_card <= 6: return False
+    return True
+
+# lookup tables indexed by hand code (and card / dealer upcard up to 11)
+HAND_ADD = [[_add_card(code, card) if card in CARDS else code for card in range(12)] for code in range(N_CODES)]
+HAND_VALUE = [code >> 3 for code in range(N_CODES)]
+# usable_ace keeps the original definition: any ace in a hand that has not bust
+HAND_USABLE = [bool(code & 2) and code >> 3 <= 21 for code in range(N_CODES)]
+# soft for the split proxy: holds an ace and the raw card sum never went over 21
+HAND_SOFT = [bool(code & 2) and not code & 1 and code >> 3 <= 21 for code in range(N_CODES)]
+AUTO_HIT = [[_auto_hit(code, d) for d in range(12)] for code in range(N_CODES)]
+STATES = [[[(HAND_VALUE[code], d, HAND_USABLE[code], bool(pair)) for pair in (0, 1)]
+           for d in range(12)] for code in range(N_CODES)]
@@ -0,0 +1,186 @@
+import numpy as np
+import multiprocessing as mp
+import os
+import time
+from vector_env import VectorBlackjackEnv
+from state_index import (N_STATES, encode_states, decode_states, greedy_action, chart_index,
+                         LEGAL_MASKS, ACTION_CHARS)
+
+# policy tables are (3, N_STATES) actions, one row per legal action set of state_index
+
+# multi-deck basic strategy, dealer stands on soft 17, rows as in state_index.CHART_ROWS;
+# 'D' doubles or else hits, 'd' doubles or else stands (soft 18 vs 3-6)
+BASIC_STRATEGY = """
+HHHHHHHHHH HHHHHHHHHH HHHHHHHHHH HHHHHHHHHH HDDDDHHHHH DDDDDDDDHH DDDDDDDDDH HHSSSHHHHH
+SSSSSHHHHH SSSSSHHHHH SSSSSHHHHH SSSSSHHHHH SSSSSSSSSS SSSSSSSSSS SSSSSSSSSS
+HHHDDHHHHH HHHDDHHHHH HHDDDHHHHH HHDDDHHHHH HDDDDHHHHH SddddSSHHH SSSSSSSSSS SSSSSSSSSS
+PPPPPPHHHH PPPPPPHHHH HHHPPHHHHH DDDDDDDDHH PPPPPHHHHH PPPPPPHHHH PPPPPPPPPP PPPPPSPPSS
+SSSSSSSSSS PPPPPPPPPP
+"""
+
+def basic_strategy_chart():
+    # (rows, 10) chart of action indices, same layout as strategy_chart
+    rows = BASIC_STRATEGY.upper().split()
+    return np.array([[list(ACTION_CHARS).index(c) for c in row] for row in rows])
+
+def basic_strategy_fallback():
+    # chart of the move once a double is no longer legal: stand for 'd', hit otherwise
+    rows = BASIC_STRATEGY.split()
+    return np.array([[0 if c == 'd' else 1 for c in row] for row in rows])
+
+def basic_strategy_policy():
+    return chart_policy(basic_strategy_chart(), basic_strategy_fallback())
+
+def _default_policy():
+    # stand on 17+, hit otherwise, the same fallback strategy_chart uses
+    p_sum = decode_states(np.arange(N_STATES))[:, 0]
+    return np.tile(np.where(p_sum >= 17, 0, 1), (len(LEGAL_MASKS), 1))
+
+def q_policy(Q, visited=None):
+    """Greedy policy table from a Q table; unvisited states use the default."""
+    if visited is None: visited = Q.any(axis=1)
+    policy = _default_policy()
+    for legal, mask in enumerate(LEGAL_MASKS):
+        policy[legal] = np.where(visited, greedy_action(Q, mask), policy[legal])
+    return policy
+
+def chart_policy(chart, fallback=None):
+    """Policy table from a (rows, 10) chart laid out like strategy_chart.
+
+    Chart cells apply whenever their state comes up; a double or split that
+    is no longer legal becomes the fallback chart's action (hit when no
+    fallback is given), and states off the chart use the default.
+    """
+    policy = _default_policy()
+    policy[:, chart_index()] = np.asarray(chart)
+    instead = np.ones(N_STATES, dtype=policy.dtype)
+    if fallback is not None: instead[chart_index()] = np.asarray(fallback)
+    legal = LEGAL_MASKS[:, None, :].repeat(N_STATES, axis=1)
+    allowed = np.take_along_axis(legal, policy[..., None], axis=2)[..., 0]
+    return np.where(allowed, policy, instead)
+
+def play_hands(env, policy):
+    """Play one hand in every environment; returns (initial state index, total reward)."""
+    states = env.reset()
+    first = encode_states(states)
+    total = np.zeros(env.n_envs)
+    t = 0
+    while not env.done.all():
+        legal = np.where(t == 0, 1 + states[:, 3], 0)
+        states, rewards, _ = env.step(policy[legal, encode_states(states)])
+        total += rewards
+        t += 1
+    return first, total
+
+def _map_shards(worker, n_hands, n_workers, seed, *args):
+    # split n_hands over worker processes, one SeedSequence child each
+    n_workers = min(n_workers or os.cpu_count(), n_hands)
+    shares = [n_hands // n_workers + (k < n_hands % n_workers) for k in range(n_workers)]
+    jobs = [(share, child) + args for share, child in zip(shares, np.random.SeedSequence(seed).spawn(n_workers))]
+    if n_workers == 1:
+        return [worker(*jobs[0])]
+    with mp.get_context("spawn").Pool(n_workers) as pool:
+        return pool.starmap(worker, jobs)
+
+def _play_shard(n_hands, seed_seq, policy, batch_size, n_decks, dealer_mode):
+    # per initial state: hands, sum of rewards, sum of squared rewards
+    env = VectorBlackjackEnv(min(batch_size, n_hands), n_decks, seed_seq, dealer_mode)
+    stats = np.zeros((3, N_STATES))
+    for start in range(0, n_hands, env.n_envs):
+        n = min(env.n_envs, n_hands - start)
+        first, total = play_hands(env, policy)
+        first, total = first[:n], total[:n]
+        stats[0] += np.bincount(first, minlength=N_STATES)
+        stats[1] += np.bincount(first, weights=total, minlength=N_STATES)
+        stats[2] += np.bincount(first, weights=total * total, minlength=N_STATES)
+    return stats
+
+def evaluate_policy(policy, n_hands, batch_size=1 << 16, n_workers=None, seed=0, n_decks=6,
+                    dealer_mode="sample"):
+    """Expected return per hand of a fixed policy table, played in vectorized batches.
+
+    Hands are split across worker processes, each with its own SeedSequence
+    child, so a result is reproducible for a given seed and worker count.
+    Returns (mean, se, breakdown) where breakdown holds per-initial-state
+    arrays "count", "mean" and "se" indexed like state_index.
+    """
+    parts = _map_shards(_play_shard, n_hands, n_workers, seed, policy, batch_size, n_decks, dealer_mode)
+    count, total, total_sq = sum(parts)
+
+    mean = total.sum() / count.sum()
+    se = np.sqrt((total_sq.sum() / count.sum() - mean ** 2) / (count.sum() - 1))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        state_mean = total / count
+        state_se = np.sqrt((total_sq / count - state_mean ** 2) / (count - 1))
+    return mean, se, {"count": count, "mean": state_mean, "se": state_se}
+
+def _compare_shard(n_hands, seed_seq, policies, batch_size, n_decks, dealer_mode, hand_stride):
+    # one env per policy from the same seed, so hand k gets the same cards under every policy
+    n_envs = min(batch_size, n_hands)
+    envs = [VectorBlackjackEnv(n_envs, n_decks, seed_seq, dealer_mode, hand_stride) for _ in policies]
+    total = np.zeros(len(policies))
+    cross = np.zeros((len(policies), len(policies)))
+    for start in range(0, n_hands, n_envs):
+        n = min(n_envs, n_hands - start)
+        rewards = np.array([play_hands(env, policy)[1][:n] for env, policy in zip(envs, policies)])
+        total += rewards.sum(axis=1)
+        cross += rewards @ rewards.T
+    return total, cross
+
+def compare_policies(policies, n_hands, batch_size=1 << 16, n_workers=None, seed=0, n_decks=6,
+                     dealer_mode="sample", hand_stride=32):
+    """Paired comparison of policy tables on common random numbers.
+
+    Every policy plays the same hands, dealt from identical shoes with one
+    hand_stride window of cards per hand, so differences between policies
+    come from the decisions rather than the cards. Returns (mean, se, diff,
+    diff_se): per-policy means and standard errors, and the matrices of
+    paired differences mean[i] - mean[j] with their standard errors.
+    """
+    parts = _map_shards(_compare_shard, n_hands, n_workers, seed, policies, batch_size, n_decks,
+                        dealer_mode, hand_stride)
+    mean = sum(p[0] for p in parts) / n_hands
+    cross = sum(p[1] for p in parts) / n_hands
+
+    # covariance of the per-hand rewards, then var(a - b) = var(a) + var(b) - 2 cov(a, b)
+    cov = (cross - np.outer(mean, mean)) * n_hands / (n_hands - 1)
+    var = np.diag(cov)
+    diff = mean[:, None] - mean[None, :]
+    diff_var = np.maximum(var[:, None] + var[None, :] - 2 * cov, 0.0)
+    return mean, np.sqrt(var / n_hands), diff, np.sqrt(diff_var / n_hands)
+
+def print_report(mean, se, breakdown, policy=None, top=10):
+    # overall edge with a 95% interval, then the initial states costing the player the most
+    print(f"Expected return per hand: {mean:+.5f} ± {1.96 * se:.5f} (house edge {-mean:.3%})")
+    count, state_mean, state_se = breakdown["count"], breakdown["mean"], breakdown["se"]
+    cost = np.where(count > 0, state_mean * count / count.sum(), 0.0)
+    for s in np.argsort(cost)[:top]:
+        p_sum, d_card, usable_ace, is_pair = decode_states(s)
+        hand = f"{'pair ' if is_pair else 'soft ' if usable_ace else 'hard '}{p_sum} vs {d_card}"
+        move = f"  {ACTION_CHARS[policy[1 + is_pair, s]]}" if policy is not None else ""
+        print(f"  {hand:<16}{move}  {state_mean[s]:+.4f} ± {1.96 * state_se[s]:.4f}"
+              f"  ({count[s] / count.sum():.2%} of hands)")
+
+def print_comparison(names, mean, se, diff, diff_se):
+    # each policy against the first, with the hands saved relative to independent runs
+    for k, name in enumerate(names):
+        print(f"{name:<12}{mean[k]:+.5f} ± {1.96 * se[k]:.5f}")
+    for k in range(1, len(names)):
+        ratio = (se[0] ** 2 + se[k] ** 2) / diff_se[k, 0] ** 2 if diff_se[k, 0] > 0 else np.inf
+        print(f"{names[k]} - {names[0]}: {diff[k, 0]:+.5f} ± {1.96 * diff_se[k, 0]:.5f}"
+              f" (paired variance {ratio:.1f}x lower than independent runs)")
+
+if __name__ == "__main__":
+    from mc_agent_week5 import run_off_policy_batched
+    Q_final, C_final = run_off_policy_batched(2000000)
+    policy = q_policy(Q_final, C_final.any(axis=1))
+
+    start_time = time.time()
+    mean, se, breakdown = evaluate_policy(policy, 20000000)
+    print(f"Evaluated 20000000 hands in {time.time()-start_time:.0f}s.")
+    print_report(mean, se, breakdown, policy)
+
+    # paired against basic strategy on the same hands
+    names = ["basic", "week5"]
+    results = compare_policies([basic_strategy_policy(), policy], 5000000)
+    print_comparison(names, *results)
@@ -1,127 +1,124 @@
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from collections import defaultdict
 from blackjack_env import BlackjackEnv
+from vector_env import VectorBlackjackEnv
+from wis_batch import EpisodeBuffer, collect_episodes, wis_update
+from rng_streams import make_streams, RandomBuffer
+from convergence import ConvergenceMonitor
+from checkpoint import save_checkpoint, stream_state, resume_training
+from state_index import (make_table, encode_state, legal_set, greedy_action,
+                         LEGAL_MASKS, LEGAL_ACTIONS, strategy_chart)
 import time
 
-def run_off_policy_task(episodes):
-    env = BlackjackEnv()
+def wis_episode_update(Q, C, episode, monitor=None):
+    # weighted importance sampling, backward over (s, a, r, prob_b, legal mask) steps,
+    # stopping at the first action the greedy target policy would not take
+    G = 0.0
+    W = 1.0
+    for t in range(len(episode)-1, -1, -1):
+        s, a, r, prob_b, mask = episode[t]
+        G += r
+        
+        C[s, a] += W
+        Q[s, a] += (W / C[s, a]) * (G - Q[s, a])
+        if monitor is not None: monitor.observe(s, a, G, W)
+        
+        # check if action matches target policy (greedy)
+        if a != greedy_action(Q[s], mask):
+            break
+        
+        W = W * (1.0 / prob_b)
+
+def run_off_policy_task(episodes, seed=None, checkpoint_dir=None, checkpoint_every=100000, resume=False,
+                        monitor=None):
+    streams = make_streams(seed)
+    env = BlackjackEnv(streams["env"])
+    rng = RandomBuffer(streams["agent"])
     
     # q(s,a) and cumulative denominator c(s,a)
-    Q = defaultdict(lambda: np.zeros(4))
-    C = defaultdict(lambda: np.zeros(4))
+    Q = make_table()
+    C = make_table()
     
     # fixed exploration for behavior policy
     epsilon = 0.2 
     
     print(f"Training off-policy mc for {episodes} episodes...")
     start_time = time.time()
+
+    # pick up tables, epsilon and random streams from the newest checkpoint
+    first, meta = resume_training(checkpoint_dir if resume else None, episodes, env, rng, {"Q": Q, "C": C})
+    if meta: epsilon = meta["epsilon"]
     
-    for i in range(1, episodes + 1):
+    for i in range(first, episodes + 1):
         state = env.reset()
         episode = []
         done = False
         
         # generate episode using behavior policy
         while not done:
-            p_sum, d_card, ace, pair = state
+            s = encode_state(state)
             
             # identify legal moves
-            legal = [0, 1]
-            if len(episode) == 0:
-                legal.append(2)
-                if pair: legal.append(3)
+            legal = legal_set(len(episode) == 0, state[3])
+            actions = LEGAL_ACTIONS[legal]
 
-            # calculate behavior probabilities
-            probs = np.zeros(4)
-            for action in legal:
-                probs[action] = epsilon / len(legal)
-                
-            current_q = [Q[state][a] if a in legal else -float('inf') for a in range(4)]
-            best_legal = np.argmax(current_q)
-            probs[best_legal] += (1.0 - epsilon)
-            
-            action = np.random.choice(range(4), p=probs)
-            prob_b = probs[action]
+            # behavior policy: uniform over legal moves with probability epsilon, else greedy
+            best_legal = greedy_action(Q[s], LEGAL_MASKS[legal])
+            action = rng.choice(actions) if rng.random() < epsilon else best_legal
+            prob_b = epsilon / len(actions) + (1.0 - epsilon) * (action == best_legal)
             
             next_state, reward, done = env.step(action)
-            episode.append((state, action, reward, prob_b, legal))
+            episode.append((s, action, reward, prob_b, LEGAL_MASKS[legal]))
             state = next_state
         
         # update q-values using weighted importance sampling
-        G = 0.0
-        W = 1.0
-        for t in range(len(episode)-1, -1, -1):
-            s, a, r, prob_b, legal_actions = episode[t]
-            G += r
-            
-            C[s][a] += W
-            Q[s][a] += (W / C[s][a]) * (G - Q[s][a])
-            
-            # check if action matches target policy (greedy)
-            qs_legal = [Q[s][act] if act in legal_actions else -float('inf') for act in range(4)]
-            if a != np.argmax(qs_legal):
-                break
-            
-            W = W * (1.0 / prob_b)
+        wis_episode_update(Q, C, episode, monitor)
             
         if i % 10000 == 0:
             print(f"\rProgress: {i}/{episodes} | Time: {time.time()-start_time:.0f}s", end="")
 
+        if checkpoint_dir and i % checkpoint_every == 0:
+            tables, meta = stream_state(env, rng)
+            tables.update(Q=Q, C=C)
+            meta.update(episode=i, episodes=episodes, epsilon=epsilon)
+            save_checkpoint(checkpoint_dir, tables, meta)
+
+        # stop once the greedy policy is stable and its action gaps are resolved
+        if monitor is not None and i % monitor.window == 0 and monitor.check(i, Q):
+            break
+
     print("\nTraining complete.")
-    return Q
+    if monitor is not None: print(monitor.report(episodes))
+    return Q, C
 
-def plot_strategy(Q):
-    dealer_range = range(2, 12)
-    map_act = {0:'S', 1:'H', 2:'D', 3:'P'}
-    
-    def get_best(s, d, ace, pair):
-        legal = [0, 1, 2]
-        if pair: legal.append(3)
-        
-        if (s, d, ace, pair) not in Q: 
-            return 'S' if s >= 17 else 'H'
+def run_off_policy_batched(episodes, batch_size=4096, seed=None):
+    streams = make_streams(seed)
+    env = VectorBlackjackEnv(batch_size, seed=streams["env"])
+    rng = streams["agent"]
 
-        qs = Q[(s, d, ace, pair)]
-        best_idx = legal[np.argmax([qs[x] for x in legal])]
-        return map_act[best_idx]
+    Q = make_table()
+    C = make_table()
+    epsilon = 0.2
+    buffer = EpisodeBuffer(batch_size)
 
-    # hard totals
-    hard = [[get_best(s, d, False, False) for d in dealer_range] for s in range(5, 20)]
-    
-    # soft totals
-    soft = [[get_best(s, d, True, False) for d in dealer_range] for s in range(13, 21)]
-    
-    # pair configurations
-    pair_configs = [
-        (4, False), (6, False), (8, False), (10, False), (12, False), 
-        (14, False), (16, False), (18, False), (20, False), (12, True)
-    ]
-    pairs = [[get_best(p_sum, d, is_ace, True) for d in dealer_range] for p_sum, is_ace in pair_configs]
+    print(f"Training batched off-policy mc for {episodes} episodes...")
+    start_time = time.time()
 
-    # labels for heatmap
-    hard_labels = [str(i) for i in range(5, 20)]
-    soft_labels = [f"A,{i-11}" for i in range(13, 21)]
-    pair_labels = ["2,2","3,3","4,4","5,5","6,6","7,7","8,8","9,9","T,T","A,A"]
-    
-    all_data = hard + soft + pairs
-    all_labels = hard_labels + soft_labels + pair_labels
-    
-    val_map = {'S':0, 'H':1, 'D':2, 'P':3}
-    num_data = [[val_map[item] for item in row] for row in all_data]
+    # each batch is played with the behavior policy of the Q at the start of the batch, so the
+    # behavior policy lags up to batch_size episodes behind run_off_policy_task's; the update
+    # itself gives the same C and Q as wis_episode_update over the batch's episodes in order
+    for start in range(0, episodes, batch_size):
+        collect_episodes(env, Q, epsilon, rng, buffer)
+        wis_update(Q, C, buffer, min(batch_size, episodes - start))
+        done = min(start + batch_size, episodes)
+        print(f"\rProgress: {done}/{episodes} | Time: {time.time()-start_time:.0f}s", end="")
 
-    plt.figure(figsize=(10, 18))
-    cmap = sns.color_palette(["#d62728", "#2ca02c", "#1f77b4", "#bcbd22"]) 
-    
-    sns.heatmap(num_data, annot=np.array(all_data), fmt="", 
-                xticklabels=[2,3,4,5,6,7,8,9,10,'A'], 
-                yticklabels=all_labels, cmap=cmap, cbar=False, linewidths=0.5, linecolor='gray')
-    
-    plt.title("off-policy optimal strategy", fontsize=15)
-    plt.savefig("week5_strategy.png")
-    print("'week5_strategy.png' saved.")
+    print("\nTraining complete.")
+    return Q, C
+
+def plot_strategy(Q, visited=None):
+    # rendering is imported on demand so training never loads matplotlib
+    from render import plot_chart
+    plot_chart(strategy_chart(Q, visited), "off-policy optimal strategy", "week5_strategy.png")
 
 if __name__ == "__main__":
-    Q_final = run_off_policy_task(5000000)
-    plot_strategy(Q_final)
\ No newline at end of file
+    Q_final, C_final = run_off_policy_task(5000000, monitor=ConvergenceMonitor())
+    plot_strategy(Q_final, C_final.any(axis=1))
\ No newline at end of file
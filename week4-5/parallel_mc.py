@@ -0,0 +1,86 @@
+import numpy as np
+import multiprocessing as mp
+import os
+import time
+from blackjack_env import BlackjackEnv
+from rng_streams import make_streams, RandomBuffer
+from mc_agent_week4 import play_glie_episode, first_visit_update, plot_strategy
+from state_index import make_table
+
+def glie_epsilon(g, decay_rate, epsilon_min):
+    # epsilon used for global episode g, independent of which shard plays it
+    return max(epsilon_min, decay_rate ** g)
+
+def _shard_worker(conn, seed_seq, shard, n_shards, decay_rate, epsilon_min):
+    streams = make_streams(seed_seq)
+    env = BlackjackEnv(streams["env"])
+    rng = RandomBuffer(streams["agent"])
+    while True:
+        msg = conn.recv()
+        if msg is None: break
+        start, stop, Q_sum, Q_count = msg
+
+        # local copies of the global tables, updated as this shard plays
+        base_sum, base_count = Q_sum.copy(), Q_count.copy()
+        Q = np.divide(Q_sum, Q_count, out=np.zeros_like(Q_sum), where=Q_count > 0)
+        for g in range(start + shard, stop, n_shards):
+            epsilon = glie_epsilon(g, decay_rate, epsilon_min)
+            episode = play_glie_episode(env, Q, epsilon, rng)
+            first_visit_update(episode, Q_sum, Q_count, Q)
+
+        conn.send((Q_sum - base_sum, Q_count - base_count))
+    conn.close()
+
+def run_task_2_parallel(episodes, n_workers=None, merge_every=10000, seed=0):
+    """GLIE MC control sharded over worker processes.
+
+    Each round every worker plays merge_every episodes against a snapshot of
+    the global tables and sends back its return sums and visit counts, which
+    are merged in shard order. Episodes are interleaved across shards so the
+    epsilon schedule follows the global episode count, and each shard draws
+    from its own SeedSequence child so a run is reproducible from seed.
+    """
+    n_workers = n_workers or os.cpu_count()
+    epsilon_min = 0.005
+    decay_steps = int(episodes * 0.4)
+    decay_rate = epsilon_min ** (1 / decay_steps)
+
+    Q_sum = make_table()
+    Q_count = make_table()
+
+    ctx = mp.get_context("spawn")
+    conns, procs = [], []
+    for shard, child in enumerate(np.random.SeedSequence(seed).spawn(n_workers)):
+        parent, conn = ctx.Pipe()
+        p = ctx.Process(target=_shard_worker,
+                        args=(conn, child, shard, n_workers, decay_rate, epsilon_min))
+        p.start()
+        conns.append(parent)
+        procs.append(p)
+
+    print(f"Training for {episodes} episodes on {n_workers} workers...")
+    start_time = time.time()
+    try:
+        for start in range(0, episodes, merge_every * n_workers):
+            stop = min(start + merge_every * n_workers, episodes)
+            for conn in conns:
+                conn.send((start, stop, Q_sum, Q_count))
+            for conn in conns:
+                d_sum, d_count = conn.recv()
+                Q_sum += d_sum
+                Q_count += d_count
+            epsilon = glie_epsilon(stop, decay_rate, epsilon_min)
+            print(f"\rProgress: {stop}/{episodes} | Epsilon: {epsilon:.4f} | Time: {time.time()-start_time:.0f}s", end="")
+    finally:
+        for conn in conns:
+            conn.send(None)
+        for p in procs:
+            p.join()
+
+    print("\nTraining complete.")
+    Q = np.divide(Q_sum, Q_count, out=np.zeros_like(Q_sum), where=Q_count > 0)
+    return Q, Q_count
+
+if __name__ == "__main__":
+    Q_final, counts = run_task_2_parallel(2000000)
+    plot_strategy(Q_final, counts.any(axis=1))
@@ -0,0 +1,19 @@
+import matplotlib.pyplot as plt
+import seaborn as sns
+from state_index import CHART_LABELS, ACTION_CHARS
+
+# plotting lives here so training and evaluation never import matplotlib
+
+def plot_chart(chart, title, filename):
+    # hard totals, soft totals and pairs as one (rows, dealer upcard) action grid
+    plt.figure(figsize=(10, 18))
+    cmap = sns.color_palette(["#d62728", "#2ca02c", "#1f77b4", "#bcbd22"])
+
+    sns.heatmap(chart, annot=ACTION_CHARS[chart], fmt="",
+                xticklabels=[2,3,4,5,6,7,8,9,10,'A'],
+                yticklabels=CHART_LABELS, cmap=cmap, cbar=False, linewidths=0.5, linecolor='gray')
+
+    plt.title(title, fontsize=15)
+    plt.savefig(filename)
+    plt.close()
+    print(f"'{filename}' saved.")
@@ -0,0 +1,30 @@
+import numpy as np
+
+# every random consumer gets its own Generator spawned from one SeedSequence
+STREAMS = ("env", "agent")
+
+def make_streams(seed=None, names=STREAMS):
+    # seed may be an int, None or a SeedSequence (e.g. a child handed to a worker)
+    root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    return {name: np.random.default_rng(child) for name, child in zip(names, root.spawn(len(names)))}
+
+class RandomBuffer:
+    """Uniform draws for scalar hot loops, refilled from a Generator in bulk.
+
+    Exposes random() and choice() like np.random, so it can be passed wherever
+    the agents take an rng.
+    """
+
+    def __init__(self, rng, size=1 << 16):
+        self.rng = rng
+        self.size = size
+        self.buffer = []
+
+    def random(self):
+        if not self.buffer:
+            self.buffer = self.rng.random(self.size).tolist()
+        return self.buffer.pop()
+
+    def choice(self, options):
+        # uniform categorical draw over options
+        return options[int(self.random() * len(options))]
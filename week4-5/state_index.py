@@ -0,0 +1,77 @@
+import numpy as np
+
+# player sums run from 4 (2,2) to 31 (hitting a hard 21 with a ten), upcards from 2 to 11
+MIN_SUM, MAX_SUM = 4, 31
+N_SUMS = MAX_SUM - MIN_SUM + 1
+N_DEALER = 10
+N_STATES = N_SUMS * N_DEALER * 4
+N_ACTIONS = 4
+
+# legal action sets: 0 = later moves, 1 = first move, 2 = first move on a pair
+LEGAL_MASKS = np.array([
+    [True, True, False, False],
+    [True, True, True, False],
+    [True, True, True, True],
+])
+LEGAL_ACTIONS = [np.flatnonzero(mask) for mask in LEGAL_MASKS]
+
+def make_table():
+    return np.zeros((N_STATES, N_ACTIONS))
+
+def encode_state(state):
+    p_sum, d_card, usable_ace, is_pair = state
+    return (((p_sum - MIN_SUM) * N_DEALER + d_card - 2) * 2 + int(usable_ace)) * 2 + int(is_pair)
+
+def encode_states(states):
+    # vectorized encode_state over an (N, 4) state array
+    s = np.asarray(states, dtype=np.int64)
+    return (((s[..., 0] - MIN_SUM) * N_DEALER + s[..., 1] - 2) * 2 + s[..., 2]) * 2 + s[..., 3]
+
+def decode_states(idx):
+    idx = np.asarray(idx)
+    is_pair = idx % 2
+    usable_ace = idx // 2 % 2
+    d_card = idx // 4 % N_DEALER + 2
+    p_sum = idx // (4 * N_DEALER) + MIN_SUM
+    return np.stack([p_sum, d_card, usable_ace, is_pair], axis=-1)
+
+def legal_set(first_move, pair):
+    return int(first_move) * (1 + int(pair))
+
+def greedy_action(q, mask):
+    # argmax over legal actions, ties go to the lowest action like the list-based version
+    return np.argmax(np.where(mask, q, -np.inf), axis=-1)
+
+# strategy chart rows: hard 5-19, soft A,2-A,9 and the ten pairs
+CHART_ROWS = (
+    [(s, False, False) for s in range(5, 20)]
+    + [(s, True, False) for s in range(13, 21)]
+    + [(s, False, True) for s in range(4, 22, 2)]
+    + [(12, True, True)]
+)
+CHART_LABELS = (
+    [str(i) for i in range(5, 20)]
+    + [f"A,{i-11}" for i in range(13, 21)]
+    + ["2,2", "3,3", "4,4", "5,5", "6,6", "7,7", "8,8", "9,9", "T,T", "A,A"]
+)
+ACTION_CHARS = np.array(['S', 'H', 'D', 'P'])
+
+def chart_index():
+    # (rows, 10) state indices, one column per dealer upcard 2..11
+    rows = np.array(CHART_ROWS, dtype=np.int64)
+    states = np.empty((len(rows), N_DEALER, 4), dtype=np.int64)
+    states[..., 0] = rows[:, None, 0]
+    states[..., 1] = np.arange(2, 12)
+    states[..., 2] = rows[:, None, 1]
+    states[..., 3] = rows[:, None, 2]
+    return encode_states(states)
+
+def strategy_chart(Q, visited=None):
+    """Greedy chart actions as an int array shaped (rows, 10), matching CHART_LABELS."""
+    if visited is None: visited = Q.any(axis=1)
+    idx = chart_index()
+    states = decode_states(idx)
+    best = greedy_action(Q[idx], LEGAL_MASKS[1 + states[..., 3]])
+    # states never seen fall back to stand on 17+, hit otherwise
+    default = np.where(states[..., 0] >= 17, 0, 1)
+    return np.where(visited[idx], best, default)
@@ -0,0 +1,184 @@
+import numpy as np
+from hand_tables import HAND_ADD, HAND_VALUE, HAND_USABLE, AUTO_HIT
+from dealer_odds import STAND_EV
+
+# shared hand-code tables as arrays for fancy indexing
+ADD = np.array(HAND_ADD)
+VALUE = np.array(HAND_VALUE)
+USABLE = np.array(HAND_USABLE)
+HIT = np.array(AUTO_HIT)
+EV = np.array(STAND_EV)
+
+# card values in one deck, aces counted as 11
+DECK = np.array([2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 11] * 4, dtype=np.int8)
+
+class VectorBlackjackEnv:
+    """N independent copies of BlackjackEnv stepped in lockstep.
+
+    Shoes and hands live in NumPy arrays so one reset()/step(actions) call
+    advances every environment at once. States come back as an (N, 4) int
+    array with the same columns as BlackjackEnv.get_state:
+    (p_sum, d_card, usable_ace, is_pair).
+
+    With hand_stride set, every hand is dealt from its own fixed window of
+    hand_stride cards: the player draws from the front of the window and the
+    dealer from the back. Two envs built from the same seed then deal each
+    hand the same cards, whatever either player does, which is what the
+    common-random-numbers comparison in house_edge relies on.
+    """
+
+    def __init__(self, n_envs, n_decks=6, seed=None, dealer_mode="sample", hand_stride=None):
+        # "exact" pays the infinite-deck expected reward of standing instead of playing the dealer;
+        # the shoe modes of BlackjackEnv are not available in lockstep
+        if dealer_mode not in ("sample", "exact"):
+            raise ValueError(f"dealer_mode {dealer_mode!r} not supported here, use 'sample' or 'exact'")
+        self.n_envs = n_envs
+        self.dealer_mode = dealer_mode
+        self.rng = np.random.default_rng(seed)
+        self.shoe_size = len(DECK) * n_decks
+        self.shoes = np.tile(np.tile(DECK, n_decks), (n_envs, 1))
+        self.pos = np.zeros(n_envs, dtype=np.int64)
+        self._shuffle(np.arange(n_envs))
+
+        # hand windows: start of the next window and the dealer's next card, counting down
+        self.hand_stride = hand_stride
+        self.window = 0
+        self.tail = np.zeros(n_envs, dtype=np.int64)
+
+        # hands are blackjack_env hand codes
+        self.p_code = np.zeros(n_envs, dtype=np.int64)
+        self.p_pair = np.zeros(n_envs, dtype=bool)
+        self.p_first = np.zeros(n_envs, dtype=np.int64)
+        self.p_second = np.zeros(n_envs, dtype=np.int64)
+        self.d_code = np.zeros(n_envs, dtype=np.int64)
+        self.d_card = np.zeros(n_envs, dtype=np.int64)
+        self.done = np.ones(n_envs, dtype=bool)
+
+    def _shuffle(self, idx):
+        self.shoes[idx] = self.rng.permuted(self.shoes[idx], axis=1)
+        self.pos[idx] = 0
+
+    def draw(self, idx):
+        if self.hand_stride:
+            if (self.pos[idx] > self.tail[idx]).any():
+                raise RuntimeError(f"a hand used more than hand_stride={self.hand_stride} cards")
+        else:
+            # same rule as BlackjackEnv.draw: reshuffle once fewer than 15 cards remain
+            low = idx[self.shoe_size - self.pos[idx] < 15]
+            if len(low): self._shuffle(low)
+        cards = self.shoes[idx, self.pos[idx]].astype(np.int64)
+        self.pos[idx] += 1
+        return cards
+
+    def draw_dealer(self, idx):
+        if not self.hand_stride: return self.draw(idx)
+        if (self.pos[idx] > self.tail[idx]).any():
+            raise RuntimeError(f"a hand used more than hand_stride={self.hand_stride} cards")
+        cards = self.shoes[idx, self.tail[idx]].astype(np.int64)
+        self.tail[idx] -= 1
+        return cards
+
+    def _next_window(self):
+        # every env moves to the same window, reshuffling all shoes together once they run out
+        if self.window + self.hand_stride > self.shoe_size:
+            self._shuffle(np.arange(self.n_envs))
+            self.window = 0
+        self.pos[:] = self.window
+        self.tail[:] = self.window + self.hand_stride - 1
+        self.window += self.hand_stride
+
+    def get_states(self):
+        return np.column_stack([VALUE[self.p_code], self.d_card, USABLE[self.p_code], self.p_pair])
+
+    def reset(self, force_player_sum=None):
+        idx = np.arange(self.n_envs)
+        if self.hand_stride: self._next_window()
+        up, hole = self.draw_dealer(idx), self.draw_dealer(idx)
+        self.d_card = up
+        self.d_code = ADD[ADD[0, up], hole]
+
+        if force_player_sum == 5:
+            c1, c2 = np.full(self.n_envs, 2), np.full(self.n_envs, 3)
+        elif force_player_sum == 21:
+            c1, c2 = np.full(self.n_envs, 11), np.full(self.n_envs, 10)
+        else:
+            c1, c2 = self.draw(idx), self.draw(idx)
+        self.p_code = ADD[ADD[0, c1], c2]
+        self.p_pair = c1 == c2
+        self.p_first = c1
+        self.p_second = c2
+        self.done = np.zeros(self.n_envs, dtype=bool)
+        return self.get_states()
+
+    def step(self, actions):
+        """Apply one action per environment; finished environments are left untouched."""
+        actions = np.asarray(actions)
+        rewards = np.zeros(self.n_envs)
+        live = ~self.done
+
+        # hit and double both take one card
+        draw_idx = np.flatnonzero(live & ((actions == 1) | (actions == 2)))
+        if len(draw_idx):
+            self.p_code[draw_idx] = ADD[self.p_code[draw_idx], self.draw(draw_idx)]
+            self.p_pair[draw_idx] = False
+        p_val = VALUE[self.p_code]
+        bust = p_val > 21
+
+        hit = live & (actions == 1)
+        rewards[hit & bust] = -1
+        self.done |= hit & bust
+
+        double = live & (actions == 2)
+        rewards[double & bust] = -2
+        stand = live & ~np.isin(actions, (1, 2, 3))
+        settle = np.flatnonzero(stand | (double & ~bust))
+        if len(settle):
+            self.play_dealer(settle)
+            rewards[settle] = self._settle(p_val[settle], settle)
+            rewards[double & ~bust] *= 2
+        self.done |= stand | double
+
+        split = np.flatnonzero(live & (actions == 3))
+        if len(split):
+            rewards[split] = self._split(split)
+            self.done[split] = True
+
+        return self.get_states(), rewards, self.done.copy()
+
+    def _split(self, idx):
+        d_card = self.d_card[idx]
+        hands = []
+        for first in (self.p_first[idx], self.p_second[idx]):
+            hand = ADD[ADD[0, first], self.draw(idx)]
+            hands.append(VALUE[self.auto_resolve(idx, hand, d_card)])
+
+        # dealer only draws if at least one split hand is still standing
+        need = np.zeros(len(idx), dtype=bool)
+        for val in hands: need |= val <= 21
+        if need.any(): self.play_dealer(idx[need])
+
+        reward = np.zeros(len(idx))
+        for val in hands:
+            reward += np.where(val > 21, -1, self._settle(val, idx))
+        return reward
+
+    def auto_resolve(self, idx, hand, d_card):
+        # vectorized BlackjackEnv.auto_resolve: the proxy strategy comes from AUTO_HIT
+        while True:
+            rows = np.flatnonzero(HIT[hand, d_card])
+            if not len(rows): return hand
+            hand[rows] = ADD[hand[rows], self.draw(idx[rows])]
+
+    def play_dealer(self, idx):
+        if self.dealer_mode == "exact": return
+        while True:
+            need = idx[VALUE[self.d_code[idx]] < 17]
+            if not len(need): return
+            self.d_code[need] = ADD[self.d_code[need], self.draw_dealer(need)]
+
+    def _settle(self, p_val, idx):
+        if self.dealer_mode == "exact":
+            return EV[self.d_card[idx], np.minimum(p_val, 21)]
+        d_val = VALUE[self.d_code[idx]]
+        win = (d_val > 21) | (p_val > d_val)
+        return np.where(win, 1, np.where(p_val < d_val, -1, 0))
@@ -0,0 +1,134 @@
+import numpy as np
+from state_index import N_ACTIONS, encode_states, greedy_action, LEGAL_MASKS
+
+# one row per (step, episode); steps past an episode's length are unused
+STEP_DTYPE = np.dtype([
+    ("state", np.int32),
+    ("action", np.int8),
+    ("reward", np.float64),
+    ("prob", np.float64),
+    ("legal", np.bool_, (N_ACTIONS,)),
+])
+
+class EpisodeBuffer:
+    """Preallocated (max_steps, n_episodes) step records for a batch of lockstep episodes."""
+
+    def __init__(self, n_episodes, max_steps=32):
+        self.steps = np.zeros((max_steps, n_episodes), dtype=STEP_DTYPE)
+        self.length = np.zeros(n_episodes, dtype=np.int64)
+
+    def clear(self):
+        self.length[:] = 0
+
+    def record(self, t, live, state, action, reward, prob, legal):
+        if t == len(self.steps):
+            # episodes this long are very rare, double the buffer instead of failing
+            self.steps = np.concatenate([self.steps, np.zeros_like(self.steps)])
+        row = self.steps[t]
+        row["state"][live] = state[live]
+        row["action"][live] = action[live]
+        row["reward"][live] = reward[live]
+        row["prob"][live] = prob[live]
+        row["legal"][live] = legal[live]
+        self.length[live] += 1
+
+def collect_episodes(env, Q, epsilon, rng, buffer):
+    # plays one batch with the epsilon-soft behavior policy of run_off_policy_task
+    buffer.clear()
+    states = env.reset()
+    t = 0
+    while not env.done.all():
+        live = ~env.done
+        s = encode_states(states)
+        legal = LEGAL_MASKS[np.where(t == 0, 1 + states[:, 3], 0)]
+        n_legal = legal.sum(axis=1)
+
+        # legal actions are always 0..n_legal-1, so a uniform legal move is floor(u * n_legal)
+        best = greedy_action(Q[s], legal)
+        explore = rng.random(env.n_envs) < epsilon
+        action = np.where(explore, (rng.random(env.n_envs) * n_legal).astype(np.int64), best)
+        prob = epsilon / n_legal + (1.0 - epsilon) * (action == best)
+
+        states, reward, _ = env.step(action)
+        buffer.record(t, live, s, action, reward, prob, legal)
+        t += 1
+
+def _rounds(state, length):
+    # round of each (steps from the end, episode) step: after the episode's previous
+    # step and after every earlier step on the same state, so a round's steps touch
+    # distinct states and each state sees its steps in the per-episode order
+    last = {}
+    rounds = np.full(state.shape, -1, dtype=np.int64)
+    for e, (row, n) in enumerate(zip(state.T.tolist(), length.tolist())):
+        r = -1
+        for k in range(n):
+            r = max(r, last.get(row[k], -1)) + 1
+            last[row[k]] = rounds[k, e] = r
+    return rounds
+
+def wis_update(Q, C, buffer, n_episodes=None):
+    """Weighted importance-sampling update for a batch of recorded episodes.
+
+    Gives exactly the C and Q of feeding the episodes one by one, in order,
+    through wis_episode_update, the loop of run_off_policy_task. Steps go in rounds
+    in which no two steps share a state, with every step after the one before
+    it in its episode and after earlier episodes' steps on the same state; a
+    round is then one vectorized update, and an episode drops out at its first
+    action that is no longer greedy.
+    """
+    steps = buffer.steps[:, :n_episodes]
+    length = buffer.length[:n_episodes]
+
+    # returns: reverse cumulative sum of rewards within each episode
+    rewards = np.where(np.arange(len(steps))[:, None] < length, steps["reward"], 0.0)
+    G = np.cumsum(rewards[::-1], axis=0)[::-1]
+
+    # step records re-indexed by (steps from the end, episode)
+    t = np.maximum(length - 1 - np.arange(length.max(initial=1))[:, None], 0)
+    cols = np.arange(len(length))
+    back = steps[t, cols]
+    state, legal, inv_prob = back["state"], back["legal"], 1.0 / back["prob"]
+    sa = state.astype(np.int64) * N_ACTIONS + back["action"]
+    G = G[t, cols]
+
+    # unused cells have round -1 and sort first
+    rounds = _rounds(state, length).ravel()
+    order = np.argsort(rounds, kind="stable")[(rounds < 0).sum():]
+    W = np.ones(len(length))
+    alive = length > 0
+    Q_flat, C_flat = Q.reshape(-1), C.reshape(-1)
+    for cells in np.split(order, np.flatnonzero(np.diff(rounds[order])) + 1):
+        k, ep = np.divmod(cells, len(length))
+        k, ep = k[alive[ep]], ep[alive[ep]]
+        if not len(ep): continue
+
+        # same arithmetic as the per-episode loop; states are distinct within a round
+        idx, w = sa[k, ep], W[ep]
+        C_flat[idx] += w
+        Q_flat[idx] += (w / C_flat[idx]) * (G[k, ep] - Q_flat[idx])
+
+        # episodes go on while their action is greedy under the updated Q
+        s = state[k, ep]
+        greedy = idx - s * N_ACTIONS == greedy_action(Q[s], legal[k, ep])
+        alive[ep[~greedy]] = False
+        W[ep[greedy]] = w[greedy] * inv_prob[k[greedy], ep[greedy]]
+
+if __name__ == "__main__":
+    # replay recorded batches through run_off_policy_task's per-episode update and compare
+    from vector_env import VectorBlackjackEnv
+    from mc_agent_week5 import wis_episode_update
+    from state_index import make_table
+    batch_size = 4096
+    env = VectorBlackjackEnv(batch_size, seed=1)
+    rng = np.random.default_rng(0)
+    buffer = EpisodeBuffer(batch_size)
+    Q, C, Q_seq, C_seq = (make_table() for _ in range(4))
+    for _ in range(5):
+        collect_episodes(env, Q, 0.2, rng, buffer)
+        wis_update(Q, C, buffer)
+        for e in range(batch_size):
+            rows = buffer.steps[:buffer.length[e], e]
+            wis_episode_update(Q_seq, C_seq, list(zip(rows["state"].tolist(), rows["action"].tolist(),
+                                                      rows["reward"].tolist(), rows["prob"].tolist(), rows["legal"])))
+    print(f"max |Q - Q_seq| = {np.abs(Q - Q_seq).max()}, max |C - C_seq| = {np.abs(C - C_seq).max()}")
+    assert np.array_equal(Q, Q_seq) and np.array_equal(C, C_seq)